@@ -431,7 +431,10 @@ class BIN_Db:
             """ Return a score for a noun word form, based on the
                 [noun_preferences] section in Prefs.conf """
             sc = NounPreferences.DICT.get(m.ordmynd.split("-")[-1])
-            return 0 if sc is None else sc.get(m.ordfl, 0)
+            if sc is None:
+                return 0
+            ix = NounPreferences.GENDER_INDEX.get(m.ordfl)
+            return 0 if ix is None else sc[ix]
 
         # Begin by looking up the word form
         _, mm = lookup_func(w)
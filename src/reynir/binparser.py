@@ -41,6 +41,7 @@ import re
 from datetime import datetime
 from functools import reduce
 import json
+from sys import intern
 
 from tokenizer import TOK, Abbreviations
 
@@ -66,6 +67,9 @@ from .baseparser import Base_Parser
 # This is the base path where we expect to find the Reynir.grammar file
 _PATH = os.path.dirname(__file__)
 
+# Shared empty set, returned from lookups that find nothing
+_EMPTY_SET = frozenset()
+
 
 class BIN_Token(Token):
 
@@ -554,7 +558,7 @@ class BIN_Token(Token):
 
     def verb_subject_matches(self, verb, subj):
         """ Returns True if the given subject type/case is allowed for this verb """
-        return subj in self._VERB_SUBJECTS.get(verb, set())
+        return subj in self._VERB_SUBJECTS.get(verb, _EMPTY_SET)
 
     def verb_matches(self, verb, terminal, form):
         """ Return True if the infinitive in question matches the verb category,
@@ -1074,7 +1078,7 @@ class BIN_Token(Token):
                     assert False, "Unknown subject case for adjective"
                 # Decompose compound word
                 lastpart = m.stofn.rsplit("-", maxsplit=1)[-1]
-                scases = self._ADJ_ARGUMENTS.get(lastpart, set())
+                scases = self._ADJ_ARGUMENTS.get(lastpart, _EMPTY_SET)
                 if scase not in scases:
                     # This adjective cannot take an argument in the given case
                     return False
@@ -1444,7 +1448,9 @@ class VariantHandler:
                 parts += rest[1:].split("_")
         else:
             parts = self._name.split("_")
-        self._first = parts[0]
+        # The category is interned, so that comparisons with
+        # category strings are usually by identity
+        self._first = intern(parts[0])
         # The variant set for this terminal, i.e.
         # tname_var1_var2_var3 -> { 'var1', 'var2', 'var3' }
         self._vparts = parts[1:]
@@ -1461,10 +1467,14 @@ class VariantHandler:
         # so_0 -> self._cases = ""
         # so_1_þgf -> self._cases = "þgf"
         # so_2_þf_þgf -> self._cases = "þf_þgf"
+        # The same cases are stored as a tuple in self._case_tuple,
+        # i.e. (), ("þgf",) and ("þf", "þgf"), respectively
         if self._vcount >= 1 and self._vparts[0] in "012":
             ncases = int(self._vparts[0])
-            self._cases = "".join("_" + self._vparts[1 + i] for i in range(ncases))
+            self._case_tuple = tuple(self._vparts[1 : 1 + ncases])
+            self._cases = "".join("_" + c for c in self._case_tuple)
         else:
+            self._case_tuple = ()
             self._cases = ""
 
     def startswith(self, part):
@@ -1524,6 +1534,13 @@ class VariantHandler:
         """ Return the verb cases associated with a so_ terminal, or empty string """
         return self._cases
 
+    @property
+    def verb_case_tuple(self):
+        """ Return the verb cases associated with a so_ terminal as a tuple,
+            or an empty tuple. This is the form used in the keys of
+            the VerbObjects lexicon. """
+        return self._case_tuple
+
     def has_variant(self, v):
         """ Returns True if the terminal name has the given variant """
         return v in self._vset
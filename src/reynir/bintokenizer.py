@@ -26,7 +26,7 @@
 
 """
 
-from collections import namedtuple, defaultdict
+from collections import namedtuple
 
 from tokenizer import tokenize_without_annotation, TOK
 
@@ -35,7 +35,7 @@ from tokenizer import tokenize_without_annotation, TOK
 from tokenizer import correct_spaces, paragraphs, parse_tokens, tokenize as raw_tokenize
 
 from .settings import StaticPhrases, AmbigPhrases, DisallowedNames
-from .settings import NamePreferences
+from .settings import NamePreferences, compile_phrase_trie
 from .bindb import BIN_Db, BIN_Meaning
 
 
@@ -1046,18 +1046,25 @@ class MatchingStream:
         and calling a matching function whenever those sequences
         occur in the stream, providing an opportunity to
         replace or modify these sequences.
+        The phrase dictionary has the form
+        { firstword: [ (restword_list, phrase_index) ] }.
+        Alternatively, an already compiled trie of the dictionary
+        (see settings.compile_phrase_trie()) can be passed
+        in the phrase_trie parameter.
     """
 
-    def __init__(self, phrase_dictionary):
-        self._pdict = phrase_dictionary
+    def __init__(self, phrase_dictionary=None, phrase_trie=None):
+        if phrase_trie is None:
+            phrase_trie = compile_phrase_trie(phrase_dictionary or {})
+        self._pdict = phrase_trie
 
     def key(self, token):
         """ Generate a state key from the given token """
         return token.txt.lower()
 
     def match_state(self, key, state):
-        """ Returns an iterable of states that match the key,
-            or a falsy value if the key matches no states. """
+        """ Returns an iterable of trie nodes that match the key,
+            or a falsy value if the key matches no nodes. """
         return state.get(key)
 
     def match(self, tq, ix):
@@ -1073,8 +1080,8 @@ class MatchingStream:
     def process(self, token_stream):
         """ Generate an output stream from the input token stream """
         tq = []  # Token queue
-        state = defaultdict(list)  # Phrases we're considering
-        pdict = self._pdict  # The phrase dictionary
+        state = {}  # Phrases we're considering
+        pdict = self._pdict  # The phrase trie
 
         try:
 
@@ -1088,34 +1095,44 @@ class MatchingStream:
                         yield from tq
                         tq = []
                     # Discard the previous state, if any
-                    if state:
-                        state = defaultdict(list)
+                    state = {}
                     # ...and yield the non-matching token
                     yield token
                     continue
 
                 # Look for matches in the current state and build a new state
-                newstate = defaultdict(list)
+                newstate = {}
                 key = self.key(token)
 
-                def add_to_state(slist, index):
-                    """ Add the list of subsequent words to the new parser state """
-                    next_key = slist[0]
-                    rest = slist[1:]
-                    newstate[next_key].append((rest, index))
+                def add_to_state(children):
+                    """ Add the continuations of a trie node to the new parser state """
+                    nonlocal newstate
+                    if not newstate:
+                        # The usual case: only one node is active, and its
+                        # children dict can be used as-is (it is never modified)
+                        newstate = children
+                        return
+                    # Merge the continuations of more than one node
+                    merged = {w: list(nodes) for w, nodes in newstate.items()}
+                    for w, nodes in children.items():
+                        if w in merged:
+                            merged[w].extend(nodes)
+                        else:
+                            merged[w] = nodes
+                    newstate = merged
 
-                def accept(state):
-                    """ The current token matches the given state, either as
+                def accept(nodes):
+                    """ The current token matches the given trie nodes, either as
                         a continuation of a previous state or as an initiation
                         of a new phrase """
                     nonlocal token, newstate, tq
                     if token:
                         tq.append(token)
                         token = None
-                    # sl is the continuation list (possible next tokens)
-                    # for each state
-                    for sl, ix in state:
-                        if not sl:
+                    # children is the continuation dict (possible next tokens)
+                    # for each node
+                    for ix, children in nodes:
+                        if ix is not None:
                             # No continuation token from this state:
                             # this is a complete match
                             phrase_length = self.length(ix)
@@ -1131,14 +1148,13 @@ class MatchingStream:
                                 tq = []
                             # Make sure that we start from a fresh state and
                             # a fresh token queue when processing the next token
-                            if newstate:
-                                newstate = defaultdict(list)
+                            newstate = {}
                             # Note that it is possible to match even longer phrases
                             # by including a starting phrase in its entirety in
                             # the static phrase dictionary
                             break
                         # Nonempty continuation: add it to the next state
-                        add_to_state(sl, ix)
+                        add_to_state(children)
 
                 siter = self.match_state(key, state)
                 if siter:
@@ -1186,7 +1202,7 @@ class StaticPhraseStream(MatchingStream):
     """
 
     def __init__(self, token_ctor, auto_uppercase):
-        super().__init__(StaticPhrases.DICT)
+        super().__init__(phrase_trie=StaticPhrases.TRIE)
         self._token_ctor = token_ctor
         self._auto_uppercase = auto_uppercase
 
@@ -1215,7 +1231,8 @@ class StaticPhraseStream(MatchingStream):
             wm = wo  # Original word
         elif w in state:
             wm = w  # Lowercase version
-        return state[wm]
+        # Note: the phrase dictionary is a plain dict, so use get()
+        return state.get(wm)
 
     def match(self, tq, ix):
         w = " ".join([t.txt for t in tq])
@@ -1242,7 +1259,7 @@ class DisambiguationStream(MatchingStream):
         in the [disambiguate_phrases] section in config/Phrases.conf """
 
     def __init__(self, token_ctor):
-        super().__init__(AmbigPhrases.DICT)
+        super().__init__(phrase_trie=AmbigPhrases.TRIE)
         self._token_ctor = token_ctor
 
     def key(self, token):
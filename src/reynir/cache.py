@@ -116,16 +116,40 @@ class LFU_Cache:
                 result = func(key)
                 self.cache[key] = result
                 self.misses += 1
+                self._purge()
 
-                # Purge the 10% least frequently used cache entries
-                if len(self.cache) > self.maxsize:
-                    for key, _ in nsmallest(self.maxsize // 10,
-                        self.use_count.items(), key = itemgetter(1)):
-
-                        del self.cache[key], self.use_count[key]
+            return result
 
+    def get(self, key):
+        """ Return the cached value for a key, or None if not there.
+            Unlike lookup(), this does not hold the lock while a missing
+            value is computed: the caller computes it and calls put(). """
+        with self.lock:
+            self.use_count[key] += 1
+            result = self.cache.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
             return result
 
+    def put(self, key, value):
+        """ Store a value, typically computed after a get() miss """
+        with self.lock:
+            self.cache[key] = value
+            self._purge()
+
+    def _purge(self):
+        """ Purge the 10% least frequently used cache entries,
+            if the cache is full. Called with the lock held. """
+        if len(self.cache) > self.maxsize:
+            for key, _ in nsmallest(self.maxsize // 10,
+                self.use_count.items(), key = itemgetter(1)):
+
+                # A key may have been counted by get() but never put()
+                self.cache.pop(key, None)
+                del self.use_count[key]
+
 
 def cached(func):
     """ A decorator for caching function calls """
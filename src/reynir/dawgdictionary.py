@@ -38,6 +38,8 @@ import struct
 import mmap
 import pkg_resources
 
+from sys import intern
+
 
 _PATH = os.path.dirname(__file__) or "."
 
@@ -55,7 +57,8 @@ class Wordbase:
     @staticmethod
     def _load_resource(resource):
         """ Load a PackedDawgDictionary from a file """
-        # Assumes that the appropriate lock has been acquired
+        # Assumes that the appropriate lock has been acquired.
+        # Once loaded, the dictionaries are read without locking.
         if __package__:
             # If we're inside a package (which is by far the most common case),
             # obtain the name of a resource file through pkg_resources.
@@ -76,32 +79,44 @@ class Wordbase:
     @classmethod
     def dawg(cls):
         """ Load the combined dictionary """
-        with cls._lock:
-            if cls._dawg_all is None:
-                cls._dawg_all = Wordbase._load_resource("ordalisti-all")
-            assert cls._dawg_all is not None
-            return cls._dawg_all
+        dawg = cls._dawg_all
+        if dawg is None:
+            # Not loaded yet: acquire the lock and check again
+            with cls._lock:
+                if cls._dawg_all is None:
+                    cls._dawg_all = Wordbase._load_resource("ordalisti-all")
+                dawg = cls._dawg_all
+        assert dawg is not None
+        return dawg
 
     @classmethod
     def dawg_formers(cls):
         """ Load the dictionary of words allowed as prefixes
             in a compound word (i.e. can occur in any part except
             the last part of the compound word) """
-        with cls._lock:
-            if cls._dawg_formers is None:
-                cls._dawg_formers = Wordbase._load_resource("ordalisti-formers")
-            assert cls._dawg_formers is not None
-            return cls._dawg_formers
+        dawg = cls._dawg_formers
+        if dawg is None:
+            # Not loaded yet: acquire the lock and check again
+            with cls._lock:
+                if cls._dawg_formers is None:
+                    cls._dawg_formers = Wordbase._load_resource("ordalisti-formers")
+                dawg = cls._dawg_formers
+        assert dawg is not None
+        return dawg
 
     @classmethod
     def dawg_last(cls):
         """ Load the dictionary of words that are allowed as the last
             part of a compound word """
-        with cls._lock:
-            if cls._dawg_last is None:
-                cls._dawg_last = Wordbase._load_resource("ordalisti-last")
-            assert cls._dawg_last is not None
-            return cls._dawg_last
+        dawg = cls._dawg_last
+        if dawg is None:
+            # Not loaded yet: acquire the lock and check again
+            with cls._lock:
+                if cls._dawg_last is None:
+                    cls._dawg_last = Wordbase._load_resource("ordalisti-last")
+                dawg = cls._dawg_last
+        assert dawg is not None
+        return dawg
 
     @classmethod
     def slice_compound_word(cls, word):
@@ -109,23 +124,27 @@ class Wordbase:
         # We get back a list of lists, i.e. all possible compound word combinations
         # where each combination is a list of word parts. 
         w = cls.dawg().find_combinations(word)
+        best = None
         if w:
-            # Sort by (1) longest last part and (2) the lowest overall number of parts
-            w.sort(key=lambda x: (len(x[-1]), -len(x)), reverse=True)
             prefixes = cls.dawg_formers()
             suffixes = cls.dawg_last()
-            # Loop over the sorted combinations until we find a legal one,
-            # i.e. where the suffix is a legal suffix and all prefixes are
-            # legal prefixes
+            # Find the legal combination, i.e. where the suffix is a legal suffix
+            # and all prefixes are legal prefixes, that has (1) the longest last
+            # part and (2) the lowest overall number of parts. In case of a tie,
+            # the first such combination wins.
+            best_key = None
             for combination in w:
+                key = (len(combination[-1]), -len(combination))
+                if best_key is not None and key <= best_key:
+                    # Can't beat what we already have
+                    continue
                 if (
                     combination[-1] in suffixes
                     and all(c in prefixes for c in combination[0:-1])
                 ):
-                    # Valid combination: return it
-                    return combination
-        # No legal combination found
-        return None
+                    best, best_key = combination, key
+        # Return the best legal combination, or None if there is none
+        return best
 
 
 class FindNavigator:
@@ -139,6 +158,17 @@ class FindNavigator:
         self._len = len(word)
         self._index = 0
         self._found = False
+        self._word_idx = None
+
+    def set_vocab(self, char_index):
+        """ Translate the word to DAWG vocabulary indices, allowing
+            edges to be selected by integer comparison """
+        # Characters that are not in the vocabulary never match an edge
+        self._word_idx = [char_index.get(c, -1) for c in self._word]
+
+    def next_vocab_index(self):
+        """ Returns the vocabulary index of the next character in the word """
+        return self._word_idx[self._index]
 
     def push_edge(self, firstchar):
         """ Returns True if the edge should be entered or False if not """
@@ -182,12 +212,58 @@ class CompoundNavigator:
         together form a long (compound) word.
     """
 
-    def __init__(self, dawg, word):
+    # Per-thread pool of navigator instances that are available for reuse
+    _pool = threading.local()
+
+    def __init__(self, dawg, word, start=0, word_idx=None):
+        self._reset(dawg, word, start, word_idx)
+
+    def _reset(self, dawg, word, start, word_idx):
+        """ Prepare the navigator for a new navigation """
         self._dawg = dawg
         self._word = word
         self._len = len(word)
-        self._index = 0
+        self._index = start
         self._parts = []
+        self._word_idx = word_idx
+
+    @classmethod
+    def acquire(cls, dawg, word, start=0, word_idx=None):
+        """ Obtain a navigator for the given word, reusing a pooled
+            instance if one is available in the current thread.
+            The navigator matches the word from index start onwards;
+            word_idx, if given, is the vocabulary index list of the
+            whole word, already computed by a parent navigator. """
+        pool = getattr(cls._pool, "navigators", None)
+        if not pool:
+            return cls(dawg, word, start, word_idx)
+        nav = pool.pop()
+        nav._reset(dawg, word, start, word_idx)
+        return nav
+
+    def release(self):
+        """ Return this navigator to the pool of the current thread.
+            The navigator must not be used after this call. """
+        pool = getattr(self._pool, "navigators", None)
+        if pool is None:
+            pool = self._pool.navigators = []
+        self._dawg = None
+        self._parts = None
+        self._word_idx = None
+        pool.append(self)
+
+    def set_vocab(self, char_index):
+        """ Translate the word to DAWG vocabulary indices, allowing
+            edges to be selected by integer comparison """
+        if self._word_idx is None:
+            # Only done once per compound word: the navigators for
+            # its remaining parts share this list with us.
+            # Characters that are not in the vocabulary never match an edge
+            self._word_idx = [char_index.get(c, -1) for c in self._word]
+
+    def next_vocab_index(self):
+        """ Returns the vocabulary index of the next character in the word """
+        return self._word_idx[self._index]
 
     def push_edge(self, firstchar):
         """ Returns True if the edge should be entered or False if not """
@@ -214,13 +290,21 @@ class CompoundNavigator:
             if self._index == self._len:
                 # Complete match: return a single part
                 self._parts = [[matched]]
-            else:
-                # So far so good: try to match the rest
-                nav = CompoundNavigator(self._dawg, self._word[self._index:])
-                self._dawg.navigate(nav)
-                result = nav.result()
-                if result:
-                    self._parts.extend([[matched] + tail for tail in result])
+            elif self._word[self._index] in self._dawg._root_first_chars:
+                # So far so good, and there are words that start with
+                # the next character: try to match the rest. The new
+                # navigator continues from our current position within
+                # the same word, sharing its vocabulary indices.
+                nav = CompoundNavigator.acquire(
+                    self._dawg, self._word, self._index, self._word_idx
+                )
+                try:
+                    self._dawg.navigate(nav)
+                    result = nav.result()
+                    if result:
+                        self._parts.extend([[matched] + tail for tail in result])
+                finally:
+                    nav.release()
 
     # noinspection PyMethodMayBeStatic
     def pop_edge(self):
@@ -242,15 +326,25 @@ class PackedDawgDictionary:
         self._vocabulary = None
         self._root_offset = 0
         self._encoding = dict()
+        self._char_index = dict()
+        self._charset = frozenset()
+        self._root_first_chars = frozenset()
 
     def load(self, fname):
         """ Load a packed DAWG from a binary file """
         if self._b is not None:
             # Already loaded
             return
-        # Map the file contents to a memory map, reflected in a byte buffer
+        # Map the file contents to a memory map, reflected in a byte buffer.
+        # The pages are loaded on demand and shared between processes.
         with open(fname, mode="rb") as stream:
-            self._b = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                self._b = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Memory mapping is not available for this file
+                # (for instance on some network or virtual file systems):
+                # fall back to reading the entire file into memory
+                self._b = stream.read()
         # Check the signature
         assert self._b[0:12] == b"ReynirDawg!\n"
         # Get the DAWG vocabulary (alphabet)
@@ -264,28 +358,103 @@ class PackedDawgDictionary:
         }
         self._encoding.update(
             {
-                i | 0x80: c + "|"
+                i | 0x80: intern(c + "|")
                 for i, c in enumerate(self._vocabulary)
             }
         )
+        # Map characters to their vocabulary indices
+        self._char_index = {
+            c: i for i, c in enumerate(self._vocabulary)
+        }
+        # The set of characters that occur in the dictionary
+        self._charset = frozenset(self._vocabulary)
+        # The set of characters that words in the dictionary can start with
+        root_edges = PackedNavigation(
+            None, self._b, self._root_offset, self._encoding, self._char_index
+        )._make_iter_from_node(self._root_offset)
+        self._root_first_chars = frozenset(prefix[0] for _, prefix, _ in root_edges)
+        # Install a lookup function that is specialized to this dictionary,
+        # shadowing the generic find() method
+        self.find = self._make_find()
+
+    def _make_find(self):
+        """ Return a function that looks up a word by exact match,
+            with the state of this dictionary bound to local variables """
+        b = self._b
+        root_offset = self._root_offset
+        char_index = self._char_index
+        charset = self._charset
+        edges_of = PackedNavigation(
+            None, b, root_offset, self._encoding, char_index
+        )._make_iter_from_node
+
+        def find(word):
+            """ Look for a word in the graph, returning True
+                if it is found or False if not """
+            n = len(word)
+            if not n or not charset.issuperset(word):
+                # Empty word, or contains characters that are not in the
+                # vocabulary: no need to navigate
+                return False
+            i = 0
+            offset = root_offset
+            while True:
+                # Find the outgoing edge that starts with the next character
+                ci = char_index.get(word[i], -1)
+                for first, prefix, nextnode in edges_of(offset):
+                    if first == ci:
+                        break
+                else:
+                    return False
+                # Follow the edge for as long as it matches the word
+                lenp = len(prefix)
+                j = 0
+                while j < lenp:
+                    if prefix[j] != word[i]:
+                        return False
+                    i += 1
+                    j += 1
+                    final = False
+                    if j < lenp:
+                        if prefix[j] == "|":
+                            final = True
+                            j += 1
+                    elif nextnode == 0 or b[nextnode] & 0x80:
+                        final = True
+                    if i == n:
+                        # End of word: was it a complete one?
+                        return final
+                if nextnode == 0:
+                    return False
+                offset = nextnode
+
+        return find
 
     def find(self, word):
         """ Look for a word in the graph, returning True
             if it is found or False if not """
-        return self.__contains__(word)
-
-    def __contains__(self, word):
-        """ Enable simple lookup syntax: "word" in dawgdict """
+        # Note that once the dictionary has been loaded, this method
+        # is shadowed by a specialized function (see _make_find())
         nav = FindNavigator(word)
         self.navigate(nav)
         return nav.is_found()
 
+    def __contains__(self, word):
+        """ Enable simple lookup syntax: "word" in dawgdict """
+        return self.find(word)
+
     def find_combinations(self, word):
         """ Attempt to slice an unknown word into parts, where each part is
             a valid word form in itself, and the parts form a valid compound word. """
-        nav = CompoundNavigator(self, word)
-        self.navigate(nav)
-        return nav.result()
+        if not self._charset.issuperset(word):
+            # The word contains characters that are not in the vocabulary
+            return []
+        nav = CompoundNavigator.acquire(self, word)
+        try:
+            self.navigate(nav)
+            return nav.result()
+        finally:
+            nav.release()
 
     def navigate(self, nav):
         """ A generic function to navigate through the DAWG under
@@ -305,25 +474,47 @@ class PackedDawgDictionary:
             def pop_edge()
                 called when leaving an edge that has been navigated; returns False
                 if there is no need to visit other edges
+
+            Navigators that follow a single word, character by character,
+            may additionally implement:
+
+            def set_vocab(char_index)
+                called with a dict mapping characters to vocabulary indices
+                before the navigation starts
+            def next_vocab_index()
+                returns the vocabulary index of the next character that the
+                navigator expects; edges are entered if the index of their
+                first character equals it, and push_edge() is not called.
+                A subclass that overrides push_edge() must therefore
+                override next_vocab_index() to match.
         """
         assert self._b is not None
-        PackedNavigation(nav, self._b, self._root_offset, self._encoding).go()
+        PackedNavigation(
+            nav, self._b, self._root_offset, self._encoding, self._char_index
+        ).go()
 
 
 class PackedNavigation:
 
     """ Manages the state for a navigation while it is in progress """
 
-    # The structure used to decode an edge offset from bytes
+    # The structure used to decode an edge offset from bytes.
+    # (Measured to be faster on a memory map than int.from_bytes()
+    # on a slice or than assembling the integer from individual bytes.)
     _UINT32 = struct.Struct("<L")
 
     # Dictionary of edge iteration caches, keyed by byte buffer
     _iter_caches = dict()
 
-    def __init__(self, nav, b, root_offset, encoding):
+    def __init__(self, nav, b, root_offset, encoding, char_index):
         # Store the associated navigator
         self._nav = nav
-        # The DAWG bytearray
+        next_vocab_index = getattr(nav, "next_vocab_index", None)
+        if next_vocab_index is not None:
+            # The navigator selects edges by vocabulary index
+            nav.set_vocab(char_index)
+        self._next_vocab_index = next_vocab_index
+        # The DAWG byte buffer (a memory map or a bytes object)
         self._b = b
         self._root_offset = root_offset
         self._encoding = encoding
@@ -335,97 +526,111 @@ class PackedNavigation:
             self._iter_cache = self._iter_caches[id(b)] = dict()
 
     def _iter_from_node(self, offset):
-        """ A generator for yielding prefixes and next node offset along an edge
-            starting at the given offset in the DAWG bytearray """
+        """ A generator for yielding the first character index, the prefix and
+            the next node offset along each edge starting at the given offset
+            in the DAWG byte buffer """
         b = self._b
         encoding = self._encoding
+        unpack_uint32 = self._UINT32.unpack_from
         num_edges = b[offset] & 0x7f
         offset += 1
         for _ in range(num_edges):
             len_byte = b[offset] & 0x7f
             offset += 1
-            prefix = "".join(encoding[b[offset + j]] for j in range(len_byte))
+            first = b[offset] & 0x7f
+            # Prefixes are heavily duplicated across the graph:
+            # intern them so that identical ones share a single object
+            prefix = intern("".join(encoding[b[offset + j]] for j in range(len_byte)))
             offset += len_byte
             if b[offset - 1] & 0x80:
                 # The last character of the prefix had a final marker: nextnode is 0
                 nextnode = 0
             else:
                 # Read the next node offset
-                nextnode, = self._UINT32.unpack_from(b, offset)  # Tuple of length 1, i.e. (n, )
+                nextnode, = unpack_uint32(b, offset)  # Tuple of length 1, i.e. (n, )
                 offset += 4
-            yield prefix, nextnode
+            yield first, prefix, nextnode
 
     def _make_iter_from_node(self, offset):
-        """ Return an iterator over the prefixes and next node pointers
-            of the edge at the given offset. If this is the first time
-            that the edge is iterated, cache its unpacked contents
-            in a dictionary for quicker subsequent iteration. """
+        """ Return a sequence of (first character index, prefix, next node)
+            tuples for the edges of the node at the given offset. If this
+            is the first time that the node is visited, cache its unpacked
+            contents in a tuple for quicker subsequent iteration. """
         try:
-            d = self._iter_cache[offset]
+            t = self._iter_cache[offset]
         except KeyError:
-            d = {
-                prefix: nextnode
-                for prefix, nextnode in self._iter_from_node(offset)
-            }
-            self._iter_cache[offset] = d
-        return d.items()
+            t = tuple(self._iter_from_node(offset))
+            self._iter_cache[offset] = t
+        return t
 
-    def _navigate_from_node(self, offset, matched):
-        """ Starting from a given node, navigate outgoing edges """
-        # Go through the edges of this node and follow the ones
-        # okayed by the navigator
+    def go(self):
+        """ Perform the navigation using the given navigator """
         nav = self._nav
-        for prefix, nextnode in self._make_iter_from_node(offset):
-            if nav.push_edge(prefix[0]):
-                # This edge is a candidate: navigate through it
-                self._navigate_from_edge(prefix, nextnode, matched)
+        # The ship is ready to go
+        if not nav.accepting():
+            return
+        b = self._b
+        make_iter = self._make_iter_from_node
+        next_vocab_index = self._next_vocab_index
+        # Leave shore and navigate the open seas. Instead of recursing
+        # from node to edge to node, we maintain an explicit stack of
+        # (edge iterator, matched path) tuples, one for each node
+        # that is currently being visited.
+        stack = [(iter(make_iter(self._root_offset)), "")]
+        while stack:
+            edges, matched = stack[-1]
+            descend = None
+            # Go through the edges of this node and follow the ones
+            # okayed by the navigator
+            for first, prefix, nextnode in edges:
+                if next_vocab_index is not None:
+                    if next_vocab_index() != first:
+                        continue
+                elif not nav.push_edge(prefix[0]):
+                    continue
+                # This edge is a candidate: navigate along it
+                # as long as the navigator is accepting
+                m = matched
+                lenp = len(prefix)
+                j = 0
+                while j < lenp and nav.accepting():
+                    # See if the navigator is OK with accepting the current character
+                    if not nav.accepts(prefix[j]):
+                        # Nope: we're done with this edge
+                        break
+                    # So far, we have a match: add a letter to the matched path
+                    m += prefix[j]
+                    j += 1
+                    # Check whether the next prefix character is a vertical bar,
+                    # denoting finality
+                    final = False
+                    if j < lenp:
+                        if prefix[j] == "|":
+                            final = True
+                            j += 1
+                    elif nextnode == 0 or b[nextnode] & 0x80:
+                        # If we're at the final char of the prefix and the next node is final,
+                        # set the final flag as well (there is no trailing
+                        # vertical bar in this case)
+                        final = True
+                    # Tell the navigator where we are
+                    nav.accept(m, final)
+                if j >= lenp and nextnode != 0 and nav.accepting():
+                    # Gone through the entire edge and still have rack letters left:
+                    # continue with the next node
+                    descend = (nextnode, m)
+                    break
                 if not nav.pop_edge():
                     # Short-circuit and finish the loop if pop_edge() returns False
                     break
-
-    def _navigate_from_edge(self, prefix, nextnode, matched):
-        """ Navigate along an edge, accepting partial and full matches """
-        # Go along the edge as long as the navigator is accepting
-        b = self._b
-        lenp = len(prefix)
-        j = 0
-        nav = self._nav
-        while j < lenp and nav.accepting():
-            # See if the navigator is OK with accepting the current character
-            if not nav.accepts(prefix[j]):
-                # Nope: we're done with this edge
-                return
-            # So far, we have a match: add a letter to the matched path
-            matched += prefix[j]
-            j += 1
-            # Check whether the next prefix character is a vertical bar,
-            # denoting finality
-            final = False
-            if j < lenp:
-                if prefix[j] == "|":
-                    final = True
-                    j += 1
-            elif nextnode == 0 or b[nextnode] & 0x80:
-                # If we're at the final char of the prefix and the next node is final,
-                # set the final flag as well (there is no trailing
-                # vertical bar in this case)
-                final = True
-            # Tell the navigator where we are
-            nav.accept(matched, final)
-        # We're done following the prefix for as long as it goes and
-        # as long as the navigator was accepting
-        if j < lenp:
-            # We didn't complete the prefix, so the navigator must no longer
-            # be interested (accepting): we're done
-            return
-        if nextnode != 0 and nav.accepting():
-            # Gone through the entire edge and still have rack letters left:
-            # continue with the next node
-            self._navigate_from_node(nextnode, matched)
-
-    def go(self):
-        """ Perform the navigation using the given navigator """
-        # The ship is ready to go
-        if self._nav.accepting():
-            # Leave shore and navigate the open seas
-            self._navigate_from_node(self._root_offset, "")
+            if descend is not None:
+                nextnode, m = descend
+                stack.append((iter(make_iter(nextnode)), m))
+                continue
+            # Done with this node: leave it, and tell the navigator that
+            # we're also leaving the edge that brought us here. If the
+            # navigator doesn't want to visit further edges of the parent
+            # node, we're done with that one as well, and so on upwards.
+            stack.pop()
+            while stack and not nav.pop_edge():
+                stack.pop()
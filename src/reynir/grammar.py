@@ -61,9 +61,9 @@ from datetime import datetime
 from collections import defaultdict, OrderedDict
 
 if __package__:
-    from .settings import Settings, changedlocale
+    from .settings import Settings, sort_strings
 else:
-    from settings import Settings, changedlocale, ConfigError
+    from settings import Settings, sort_strings, ConfigError
 
 
 class GrammarError(Exception):
@@ -102,6 +102,9 @@ class Nonterminal:
 
     _INDEX = -1  # Running sequence number (negative) of all nonterminals
 
+    # Bits representing tags within tag masks, shared by all nonterminals
+    _TAG_BITS = dict()
+
     def __init__(self, name, fname=None, line=0):
         self._name = name
         # Place of initial definition in a grammar file
@@ -109,6 +112,11 @@ class Nonterminal:
         self._line = line
         # Tags for this nonterminal
         self._tags = None
+        # The tags as a bit mask, for quick checks (see tag_bit())
+        self._tag_mask = 0
+        # The tags of this nonterminal and of all nonterminals
+        # reachable from it, as a bit mask (calculated by Grammar.read())
+        self._subtree_tag_mask = 0
         # Has this nonterminal been referenced in a production?
         self._ref = False
         # Is this an optional nonterminal, i.e. one that is
@@ -184,12 +192,33 @@ class Nonterminal:
             with any of the given tags """
         return False if self._tags is None else not self._tags.isdisjoint(tagset)
 
+    @property
+    def tag_mask(self):
+        """ Return the tags of this nonterminal as a bit mask """
+        return self._tag_mask
+
+    @property
+    def subtree_tag_mask(self):
+        """ Return the tags of this nonterminal and of all nonterminals
+            reachable from it, as a bit mask """
+        return self._subtree_tag_mask
+
+    @staticmethod
+    def tag_bit(tag):
+        """ Return the bit that represents the given tag within tag masks """
+        bit = Nonterminal._TAG_BITS.get(tag)
+        if bit is None:
+            # First time we see this tag: assign a new bit to it
+            bit = Nonterminal._TAG_BITS[tag] = 1 << len(Nonterminal._TAG_BITS)
+        return bit
+
     def add_tag(self, tag):
         """ Add a tag to this nonterminal """
         if self._tags is None:
             self._tags = {tag}
         else:
             self._tags.add(tag)
+        self._tag_mask |= Nonterminal.tag_bit(tag)
 
     def __repr__(self):
         return self._name
@@ -1309,14 +1338,31 @@ class Grammar:
                     "The following nonterminals are unreachable from the root\n"
                     "and will be removed from the grammar:"
                 )
-                with changedlocale() as strxfrm:
-                    for nt in sorted([str(nt) for nt in unreachable], key=strxfrm):
-                        print("* {0}".format(str(nt)))
+                for nt in sort_strings([str(nt) for nt in unreachable]):
+                    print("* {0}".format(nt))
             # Simplify the grammar dictionary by removing unreachable nonterminals
             for nt in unreachable:
                 del grammar[nt]
                 del nonterminals[nt.name]
 
+        # Calculate the subtree tag masks, i.e. the union of the tags of
+        # each nonterminal and of all nonterminals reachable from it,
+        # by iterating until a fixed point is reached
+        for nt in grammar:
+            nt._subtree_tag_mask = nt._tag_mask
+        changed = True
+        while changed:
+            changed = False
+            for nt, plist in grammar.items():
+                mask = nt._subtree_tag_mask
+                for _, p in plist:
+                    for s in p:
+                        if isinstance(s, Nonterminal):
+                            mask |= s._subtree_tag_mask
+                if mask != nt._subtree_tag_mask:
+                    nt._subtree_tag_mask = mask
+                    changed = True
+
         # Reassign indices for nonterminals to avoid gaps in the number sequence
         # Nonterminals are indexed downwards from -1
         # We must take care to sort the dictionary before enumerating it,
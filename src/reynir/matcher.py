@@ -2097,6 +2097,10 @@ class SimpleTreeBuilder:
         self._nt_map = nt_map or _DEFAULT_NT_MAP
         self._id_map = id_map or _DEFAULT_ID_MAP
         self._terminal_map = terminal_map or _DEFAULT_TERMINAL_MAP
+        self.reset()
+
+    def reset(self):
+        """ Prepare the builder for building a new tree """
         self._result = []
         self._stack = [self._result]
         self._scope = [NotImplemented]  # Sentinel value
@@ -2237,6 +2241,12 @@ class Simplifier(ParseForestNavigator):
         self._tokens = tokens
         self._builder = SimpleTreeBuilder(nt_map, id_map, terminal_map)
 
+    def reset(self, tokens):
+        """ Prepare the simplifier for simplifying a new tree,
+            over the given tokens """
+        self._tokens = tokens
+        self._builder.reset()
+
     def visit_token(self, level, node):
         """ At terminal node, matching a token """
         meaning = node.token.match_with_meaning(node.terminal)
@@ -74,22 +74,248 @@
 """
 
 import copy
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from sys import intern
+from weakref import WeakKeyDictionary
 
 from .fastparser import Node, ParseForestNavigator, ParseForestPrinter
 from .settings import Preferences, NounPreferences, VerbObjects
+from .grammar import Nonterminal
 from .binparser import BIN_Token
-
-
-_PREP_SCOPE_SET = frozenset(("begin_prep_scope", "purge_prep", "no_prep"))
-_PREP_ALL_SET = frozenset(_PREP_SCOPE_SET | {"enable_prep_bonus"})
+from .cache import LFU_Cache
+
+
+# Bits within nonterminal tag masks
+_B_BEGIN_PREP_SCOPE = Nonterminal.tag_bit("begin_prep_scope")
+_B_PURGE_PREP = Nonterminal.tag_bit("purge_prep")
+_B_NO_PREP = Nonterminal.tag_bit("no_prep")
+_B_ENABLE_PREP_BONUS = Nonterminal.tag_bit("enable_prep_bonus")
+_B_APPLY_LENGTH_BONUS = Nonterminal.tag_bit("apply_length_bonus")
+_B_APPLY_PREP_BONUS = Nonterminal.tag_bit("apply_prep_bonus")
+_B_PICK_UP_VERB = Nonterminal.tag_bit("pick_up_verb")
+_B_PURGE_VERB = Nonterminal.tag_bit("purge_verb")
+_B_PREP_SCOPE = _B_BEGIN_PREP_SCOPE | _B_PURGE_PREP | _B_NO_PREP
+_B_PREP_ALL = _B_PREP_SCOPE | _B_ENABLE_PREP_BONUS
+_B_DELETE_VERBS = _B_BEGIN_PREP_SCOPE | _B_PURGE_VERB
 _CASES_SET = frozenset(BIN_Token.CASES)
 _VERB_PREP_BONUS = 7  # Give 7 extra points for a verb/preposition match
 _VERB_PREP_PENALTY = -2  # Subtract 2 points for a non-match
 _LENGTH_BONUS_FACTOR = 10  # For length bonus, multiply number of tokens by this factor
+_SCORE_CACHE_SIZE = 1024  # Number of terminal score lists to cache
+# Shared result for epsilon and empty nodes. Reduction results are
+# never modified once returned, so this dict must not be modified either.
+_EMPTY_SC = dict(sc=0)
 
 # Noun categories set
 _NOUN_SET = BIN_Token.GENDERS_SET  # kk, kvk, hk
+# Variant bits of cases, as checked by the scoring heuristics
+_VBIT_NF = BIN_Token.VBIT["nf"]
+_VBIT_THF = BIN_Token.VBIT["þf"]
+_VBIT_THGF = BIN_Token.VBIT["þgf"]
+_VBIT_EF = BIN_Token.VBIT["ef"]
+# BÍN categories (fl) of person and entity names
+_PERSON_FL = frozenset(("ism", "erm", "nafn", "föð", "móð", "örn", "fyr"))
+
+# Non-ASCII category strings are not interned automatically by Python
+_SERNAFN = intern("sérnafn")
+
+# Terminal attributes used by the scoring heuristics in
+# Reducer._calc_terminal_scores()
+_TerminalInfo = namedtuple(
+    "_TerminalInfo",
+    [
+        "first",
+        "is_literal",
+        "colon_cat",
+        "num_variants",
+        "var0",
+        "variants",
+        "vbits",
+        "verb_cases",
+        "gender",
+        "gender_index",
+        "is_singular",
+        "is_plural",
+        "is_abbrev",
+        "is_bh",
+        "is_sagnb",
+        "is_lh",
+        "is_lh_nt",
+        "is_mm",
+        "is_vh",
+        "is_subj",
+        "is_nh",
+        "fixed_score",
+        "rule",
+    ],
+)
+
+
+def _terminal_info(t):
+    """ Return a _TerminalInfo tuple for the given terminal """
+    ti = _TerminalInfo(
+        first=t.first,
+        is_literal=t.is_literal,
+        colon_cat=t.colon_cat,
+        num_variants=t.num_variants,
+        var0=t.variant(0) if t.num_variants > 0 else None,
+        variants=frozenset(t.variants),
+        vbits=t._vbits,
+        verb_cases=t.verb_case_tuple,
+        gender=t.gender,
+        gender_index=NounPreferences.GENDER_INDEX.get(t.gender),
+        is_singular=t.is_singular,
+        is_plural=t.is_plural,
+        is_abbrev=t.is_abbrev,
+        is_bh=t.is_bh,
+        is_sagnb=t.is_sagnb,
+        is_lh=t.is_lh,
+        is_lh_nt=t.is_lh_nt,
+        is_mm=t.is_mm,
+        is_vh=t.is_vh,
+        is_subj=t.is_subj,
+        is_nh=t.is_nh,
+        fixed_score=0,
+        rule=None,
+    )
+    return ti._replace(fixed_score=_fixed_score(ti), rule=_token_rule(ti))
+
+
+# Lists of terminal information, indexed by terminal index, for each grammar.
+# The grammars are weakly referenced, so that they can be freed.
+_GRAMMAR_TERMINAL_INFO = WeakKeyDictionary()
+
+
+def _grammar_terminal_info(grammar):
+    """ Return a list of _TerminalInfo tuples for the terminals of the
+        given grammar, indexed by terminal index """
+    tinfo = _GRAMMAR_TERMINAL_INFO.get(grammar)
+    if tinfo is None:
+        terminals = grammar.terminals_by_ix
+        tinfo = [None] * (max(terminals, default=0) + 1)
+        for ix, t in terminals.items():
+            tinfo[ix] = _terminal_info(t)
+        _GRAMMAR_TERMINAL_INFO[grammar] = tinfo
+    return tinfo
+
+
+def _token_rule(ti):
+    """ Return the category of the token-dependent heuristics that apply
+        to a terminal in Reducer._calc_terminal_scores(), or None if
+        only the fixed score applies """
+    tfirst = ti.first
+    if tfirst in {"no", "lo", "so"}:
+        return tfirst
+    if tfirst == _SERNAFN:
+        return _SERNAFN
+    if tfirst == "fs":
+        # The 'artificial' nominative prepositions only get the fixed score
+        return None if ti.vbits & _VBIT_NF else tfirst
+    if tfirst == "st" or (tfirst == "sem" and ti.colon_cat == "st"):
+        return "st"
+    return None
+
+
+def _fixed_score(ti):
+    """ Return the part of the heuristic score of a terminal that does
+        not depend on the token being matched or on its neighbors """
+    score = 0
+    if ti.is_literal:
+        # Give a bonus for exact or semi-exact matches with
+        # literal terminals
+        score += 2
+    tfirst = ti.first
+    if tfirst == "ao" or tfirst == "eo":
+        # Subtract from the score of all ao and eo
+        score -= 1
+    elif tfirst == "no":
+        if ti.is_singular:
+            # Add to singular nouns relative to plural ones
+            score += 1
+        elif ti.is_abbrev:
+            # Punish abbreviations in favor of other more specific terminals
+            score -= 1
+    elif tfirst == "fs":
+        if ti.vbits & _VBIT_NF:
+            # Reduce the weight of the 'artificial' nominative prepositions
+            # 'næstum', 'sem', 'um'
+            # Make other cases outweigh the Nl_nf bonus of +4 (-2 -3 = -5)
+            score -= 8
+    elif tfirst == "so":
+        if ti.is_bh:
+            # Discourage 'boðháttur'
+            score -= 4
+        elif ti.is_sagnb:
+            # We like sagnb and lh, it means that more
+            # than one piece clicks into place
+            score += 6
+        elif ti.is_lh:
+            # sagnb is preferred to lh, but vb (veik beyging) is discouraged
+            if "vb" in ti.variants:
+                score -= 2
+            else:
+                score += 3
+        elif ti.is_lh_nt:
+            score += 12  # Encourage LHNT rather than LO
+        elif ti.is_mm:
+            # Encourage mm forms. The encouragement should be better than
+            # the score for matching a single case, so we pick so_0_mm
+            # rather than so_1_þgf, for instance.
+            score += 3
+        elif ti.is_vh:
+            # Encourage vh forms
+            score += 2
+        if ti.is_subj:
+            # Give a small bonus for subject matches
+            if "none" in ti.variants:
+                # ... but a punishment for subj_none
+                score -= 3
+            else:
+                score += 1
+    elif tfirst == "tala":
+        if ti.vbits & _VBIT_EF:
+            # Try to avoid interpreting plain numbers as possessive phrases
+            score -= 4
+    elif tfirst == "person":
+        if ti.vbits & _VBIT_NF:
+            # Prefer person names in the nominative case
+            score += 2
+    elif tfirst == "fyrirtæki":
+        # We encourage company names to be interpreted as such,
+        # so we give company abbreviations ('hf.', 'Corp.', 'Limited')
+        # a high priority
+        score += 24
+    elif tfirst == "abfn":
+        # If we have number and gender information with the reflexive
+        # pronoun, that's good: encourage it
+        score += 6 if ti.num_variants > 1 else 2
+    elif tfirst == "gr":
+        # Encourage separate definite article rather than pronoun
+        score += 2
+    elif tfirst == "nhm":
+        # Encourage the infinitive
+        score += 4
+    return score
+
+
+def _verb_tuple(verbs):
+    """ Return a tuple of the (terminal, token) entries in a verb sequence.
+        A verb sequence, as carried up the tree in the "so" and "sl"
+        results of the reducer, is either a list of entries or a
+        (left, right) tuple denoting the concatenation of two sequences.
+        This makes concatenation O(1) at the cost of a flattening
+        step when the verbs are actually needed. """
+    result = []
+    stack = [verbs]
+    while stack:
+        v = stack.pop()
+        if v.__class__ is tuple:
+            # Concatenation: process the left sequence first
+            stack.append(v[1])
+            stack.append(v[0])
+        else:
+            result.extend(v)
+    return tuple(result)
 
 
 def copy_node(node):
@@ -97,13 +323,24 @@ def copy_node(node):
         Stop when coming to a nested preposition scope or to a
         noun phrase (Nafnliður, Nl_*) """
 
+    if node is None:
+        return None
+
+    # Copies made so far, keyed by the id of the original node.
+    # Nodes that are shared within the subtree (as they often are
+    # in a packed parse forest) are thus only copied once.
+    copies = dict()
+    # Copies whose children have yet to be copied. Using an explicit
+    # stack instead of recursion avoids deep Python call chains.
+    stack = []
+
     def dup(node):
-        """ Duplicate (copy) this node """
+        """ Duplicate (copy) this node, deferring the copying of its children """
         if node is None:
             return None
         nt = node.nonterminal if node.is_completed else None
         if nt is not None:
-            if nt.has_any_tag(_PREP_SCOPE_SET):
+            if nt.tag_mask & _B_PREP_SCOPE:
                 # No copying from this point
                 return node
             if nt.is_noun_phrase:
@@ -113,17 +350,19 @@ def copy_node(node):
             if nt.is_optional and node.is_empty:
                 # Explicitly nullable nonterminal with no child: don't bother copying
                 return node
-        # Recurse to copy the child tree as well
-        return copy_node(node)
+        c = copies.get(id(node))
+        if c is None:
+            c = copies[id(node)] = Node.copy(node)
+            stack.append(c)
+        return c
 
-    if node is None:
-        return None
-    # First, copy the node itself
-    node = Node.copy(node)
-    # Then, copy the children as required by applying the dup() function
-    node.transform_children(dup)
-    # Return the fresh copy
-    return node
+    # Return a fresh copy
+    root = copies[id(node)] = Node.copy(node)
+    stack.append(root)
+    while stack:
+        # Copy the children as required by applying the dup() function
+        stack.pop().transform_children(dup)
+    return root
 
 
 class PrepositionUnpacker(ParseForestNavigator):
@@ -137,11 +376,16 @@ class PrepositionUnpacker(ParseForestNavigator):
     def visit_nonterminal(self, level, node):
         """ Create a result object to capture information about
             productions (families of children) of this nonterminal """
+        if not node.nonterminal.subtree_tag_mask & _B_ENABLE_PREP_BONUS:
+            # No enable_prep_bonus nonterminal can occur in or under this
+            # node, so there is nothing to unpack: skip its children
+            return NotImplemented
         return defaultdict(list)
 
     def add_result(self, results, ix, r):
         """ Capture a particular child node r of family ix """
-        results[ix].append(r)
+        # Skipped nodes are as uninteresting as token nodes
+        results[ix].append(None if r is NotImplemented else r)
 
     def process_results(self, results, node):
         """ Go through the child productions (families) and
@@ -152,7 +396,7 @@ class PrepositionUnpacker(ParseForestNavigator):
             for ix, child_nt in enumerate(children):
                 # child_nt is None for all uninteresting nodes, i.e.
                 # terminal/token nodes and nonterminal nodes that are not completed
-                if child_nt is not None and child_nt.has_tag("enable_prep_bonus"):
+                if child_nt is not None and child_nt.tag_mask & _B_ENABLE_PREP_BONUS:
                     # This is a nonterminal node marked with enable_prep_bonus:
                     # Duplicate its subtree
                     node.transform_child(family_ix, ix, copy_node)
@@ -173,48 +417,54 @@ class ReductionInfo:
     def __init__(self, reducer, node):
         self.reducer = reducer
         self.node = node
-        self.sc = defaultdict(lambda: dict(sc=0))  # Child tree scores
+        # Information about child families, keyed by family index:
+        # the accumulated score of the family, and sequences of the
+        # verbs contained in ("so") and picked up by ("sl") the family
+        # (see _verb_tuple())
+        self._sc_score = dict()
+        self._sc_so = dict()
+        self._sc_sl = dict()
         # We are only interested in completed nonterminals
         self.nt = node.nonterminal if node.is_completed else None
         self.name = self.nt.name if self.nt else None
         # Verb/preposition matching stuff
-        self.pushed_prep_bonus = False
-        verb = reducer.get_current_verb()
+        prep_bonus, verb = reducer.get_context()
         if self.nt:
-            if self.nt.has_tag("enable_prep_bonus"):
-                # SagnInnskot has this tag
-                reducer.push_prep_bonus(None if verb is None else verb[:])
-                self.pushed_prep_bonus = True
-            elif self.nt.has_tag("begin_prep_scope") or self.nt.is_noun_phrase:
+            tag_mask = self.nt.tag_mask
+            if tag_mask & _B_ENABLE_PREP_BONUS:
+                # SagnInnskot has this tag. The enclosing verbs are
+                # kept as an immutable tuple that can be used as a cache key.
+                prep_bonus = None if verb is None else _verb_tuple(verb)
+            elif tag_mask & _B_BEGIN_PREP_SCOPE or self.nt.is_noun_phrase:
                 # Setning and SetningÁnF have this tag, and we also
                 # enter a new prep bonus scope in noun phrases
-                reducer.push_prep_bonus(None)
-                self.pushed_prep_bonus = True
+                prep_bonus = None
                 verb = None
-        reducer.push_current_verb(verb)
+        reducer.push_context(prep_bonus, verb)
         self.start_verb = verb
 
     def add_child_score(self, ix, sc):
         """ Add a child node's score to the parent family's score,
             where the parent family has index ix (0..n) """
-        self.sc[ix]["sc"] += sc["sc"]
-        # Carry information about contained prepositions ("fs") and verbs ("so")
-        # up the tree
-        for key in ("so", "sl"):
-            if key in sc:
-                if key in self.sc[ix]:
-                    self.sc[ix][key].extend(sc[key])
-                else:
-                    self.sc[ix][key] = sc[key][:]
-                if key == "sl":
-                    self.reducer.set_current_verb(sc[key])
+        self._sc_score[ix] += sc["sc"]
+        # Carry information about contained verbs ("so" and "sl") up the tree
+        # (verb sequences are never modified, so they can be shared)
+        so = sc.get("so")
+        if so is not None:
+            d = self._sc_so.get(ix)
+            self._sc_so[ix] = so if d is None else (d, so)
+        sl = sc.get("sl")
+        if sl is not None:
+            d = self._sc_sl.get(ix)
+            self._sc_sl[ix] = sl if d is None else (d, sl)
+            self.reducer.set_current_verb(sl)
 
     def add_child_production(self, ix, prod):
         """ Start the processing of a production (numbered ix) of a nonterminal """
         # Initialize the score of this family of children, so that productions
         # with higher priorities (more negative prio values) get a starting bonus
-        assert ix not in self.sc or "sc" not in self.sc[ix]
-        self.sc[ix]["sc"] = -10 * prod.priority
+        assert ix not in self._sc_score
+        self._sc_score[ix] = -10 * prod.priority
         self.reducer.set_current_verb(self.start_verb)
 
     def process(self, node):
@@ -223,67 +473,73 @@ class ReductionInfo:
             highest scoring one and reduce the tree to that child only """
         try:
 
-            csc = self.sc
+            csc = self._sc_score
             if not csc:
-                return dict(sc=0)  # Empty node
+                return _EMPTY_SC  # Empty node
 
             if len(csc) == 1:
                 # Not ambiguous: only one result, do a shortcut
-                [sc] = csc.values()  # Will raise an exception if not exactly one value
+                [(ix, score)] = csc.items()  # Will raise an exception if not exactly one value
             else:
                 # Eliminate all families except the best scoring one
-                # Sort in decreasing order by score, using the family index
+                # Find the highest score, using the lowest family index
                 # as a tie-breaker for determinism
-                s = sorted(csc.items(), key=lambda x: (x[1]["sc"], -x[0]), reverse=True)
-                # This is the best scoring family
-                # (and the one with the lowest index
-                # if there are many with the same score)
-                ix, sc = s[0]
+                ix = score = None
+                for fix, fscore in csc.items():
+                    if (
+                        score is None
+                        or fscore > score
+                        or (fscore == score and fix < ix)
+                    ):
+                        ix, score = fix, fscore
                 # And now for the key action of the reducer:
                 # Eliminate all other families
                 node.reduce_to(ix)
 
+            # Assemble the result for the surviving family
+            so = self._sc_so.get(ix)
+            sl = self._sc_sl.get(ix)
+
             if self.nt is not None:
-                # We will be adjusting the result: make sure we do so on
-                # a separate dict copy (we don't want to clobber the child's dict)
+                tag_mask = self.nt.tag_mask
                 # Get score adjustment for this nonterminal, if any
                 # (This is the $score(+/-N) pragma from Reynir.grammar)
-                sc["sc"] += self.reducer._score_adj.get(self.nt, 0)
+                score += self.reducer._score_adj.get(self.nt, 0)
 
-                if self.nt.has_tag("apply_length_bonus"):
+                if tag_mask & _B_APPLY_LENGTH_BONUS:
                     # Give this nonterminal a bonus depending on how many tokens
                     # it encloses
                     bonus = (self.node.end - self.node.start - 1) * _LENGTH_BONUS_FACTOR
-                    sc["sc"] += bonus
+                    score += bonus
 
                 if (
-                    self.nt.has_tag("apply_prep_bonus")
+                    tag_mask & _B_APPLY_PREP_BONUS
                     and self.reducer.get_prep_bonus() is not None
                 ):
                     # This is a nonterminal that we like to see in a verb/prep context
                     # An example is Dagsetning which we like to be associated
                     # with a verb rather than a noun phrase
-                    sc["sc"] += _VERB_PREP_BONUS
-
-                if self.nt.has_tag("pick_up_verb"):
-                    verb = sc.get("so")
-                    if verb is not None:
-                        sc["sl"] = verb[:]
+                    score += _VERB_PREP_BONUS
 
-                if self.nt.has_any_tag({"begin_prep_scope", "purge_verb"}):
+                if tag_mask & _B_DELETE_VERBS:
                     # Delete information about contained verbs
                     # SagnRuna, EinSetningÁnF, SagnHluti, NhFyllingAtv
                     # and Setning have this tag
-                    sc.pop("so", None)  # Simpler than if "so" in sc: del sc["so"]
-                    sc.pop("sl", None)
+                    return dict(sc=score)
+
+                if tag_mask & _B_PICK_UP_VERB and so is not None:
+                    sl = so
 
+            sc = dict(sc=score)
+            if so is not None:
+                sc["so"] = so
+            if sl is not None:
+                sc["sl"] = sl
             return sc
 
         finally:
-            # Make sure we pop everything that was pushed in __init__()
-            if self.pushed_prep_bonus:
-                self.reducer.pop_prep_bonus()
-            self.reducer.pop_current_verb()
+            # Make sure we pop the context that was pushed in __init__()
+            self.reducer.pop_context()
 
 
 class ParseForestReducer(ParseForestNavigator):
@@ -292,58 +548,87 @@ class ParseForestReducer(ParseForestNavigator):
         so that the highest-scoring alternative production of a nonterminal
         (family of children) survives at each point of ambiguity """
 
-    def __init__(self, grammar, scores):
+    def __init__(self, grammar, scores, offset=0):
         super().__init__()
-        # scores contains the token-terminal matching scores
+        # scores contains the token-terminal matching scores,
+        # indexed by token position relative to the given offset
+        # and then keyed by terminal index
         self._scores = scores
+        self._offset = offset
         self._grammar = grammar
         self._score_adj = grammar._nt_scores
-        self._prep_bonus_stack = [None]
-        self._current_verb_stack = [None]
+        # Stack of [prep bonus, current verb] contexts,
+        # one for each nonterminal being reduced
+        self._ctx_stack = [[None, None]]
+        # Verb/preposition bonuses, keyed first by the (verb terminal, verb token)
+        # tuple and then by the (preposition terminal, preposition text) tuple
         self._bonus_cache = dict()
+        # Verb stems with cases, keyed by the (verb terminal, verb token) tuple
+        self._verb_cache = dict()
+        # Interned preposition strings with cases, as used for lookups
+        # in the verb/preposition lexicon, keyed by (word, case)
+        self._prep_cache = dict()
+        # Token node results, keyed by (start, terminal, prep bonus context).
+        # Token nodes are duplicated by the PrepositionUnpacker, but
+        # identical copies in identical contexts get identical results.
+        self._token_cache = dict()
 
-    def push_prep_bonus(self, val):
-        self._prep_bonus_stack.append(val)
+    def push_context(self, prep_bonus, verb):
+        self._ctx_stack.append([prep_bonus, verb])
 
-    def pop_prep_bonus(self):
-        self._prep_bonus_stack.pop()
-
-    def get_prep_bonus(self):
-        return self._prep_bonus_stack[-1]
+    def pop_context(self):
+        self._ctx_stack.pop()
 
-    def push_current_verb(self, val):
-        self._current_verb_stack.append(val)
+    def get_context(self):
+        return self._ctx_stack[-1]
 
-    def pop_current_verb(self):
-        self._current_verb_stack.pop()
+    def get_prep_bonus(self):
+        return self._ctx_stack[-1][0]
 
     def get_current_verb(self):
-        return self._current_verb_stack[-1]
+        return self._ctx_stack[-1][1]
 
     def set_current_verb(self, val):
-        self._current_verb_stack[-1] = val
+        self._ctx_stack[-1][1] = val
 
-    def verb_prep_bonus(self, prep_terminal, prep_token, verb_terminal, verb_token):
-        """ Return a verb/preposition match bonus, as and if applicable """
-        # Only do this if the prepositions match the verb being connected to
+    @staticmethod
+    def verb_with_cases(verb_terminal, verb_token):
+        """ Return a key for the verb stem matched by the given terminal
+            and token, along with the cases of its arguments
+            (e.g. ('fresta', ('þgf',))) """
         m = verb_token.match_with_meaning(verb_terminal)
         verb = m.stofn
         if "MM" in m.beyging:
             # Use MM-NH nominal form for MM verbs,
             # i.e. "eignast" instead of "eiga" for a verb such as "eignaðist"
             verb = BIN_Token.mm_verb_stem(verb)
-        verb_with_cases = verb + verb_terminal.verb_cases
+        return (verb, verb_terminal.verb_case_tuple)
+
+    def prep_with_case(self, prep_terminal, prep_token):
+        """ Return the preposition text with its case appended (e.g. 'vegna_ef'),
+            or the plain text if the preposition should match all cases """
         if prep_terminal.num_variants:
             # Normal terminal, such as fs_ef
             prep_case = prep_terminal.variant(0)
             if prep_case in _CASES_SET:
-                prep_with_case = prep_token + "_" + prep_case
+                key = (prep_token, prep_case)
+                prep_with_case = self._prep_cache.get(key)
+                if prep_with_case is None:
+                    prep_with_case = self._prep_cache[key] = intern(
+                        prep_token + "_" + prep_case
+                    )
             else:
                 # Probably fs_nh: match all cases
                 prep_with_case = prep_token
         else:
             # Literal terminal, such as "á:fs" - match all cases
             prep_with_case = prep_token
+        return prep_with_case
+
+    @staticmethod
+    def match_bonus(verb_with_cases, prep_with_case):
+        """ Return the bonus for a verb/preposition match, or the
+            penalty for a mismatch """
         # Do a lookup in the verb/preposition lexicon from the settings
         # (typically stored in VerbPrepositions.conf)
         if VerbObjects.verb_matches_preposition(verb_with_cases, prep_with_case):
@@ -353,32 +638,67 @@ class ParseForestReducer(ParseForestNavigator):
         # If no match, discourage
         return _VERB_PREP_PENALTY
 
+    def verb_prep_bonus(self, prep_terminal, prep_token, verb_terminal, verb_token):
+        """ Return a verb/preposition match bonus, as and if applicable """
+        # Only do this if the prepositions match the verb being connected to
+        return self.match_bonus(
+            self.verb_with_cases(verb_terminal, verb_token),
+            self.prep_with_case(prep_terminal, prep_token),
+        )
+
     def visit_epsilon(self, level):
         """ At Epsilon node """
-        return dict(sc=0)  # Score 0
+        return _EMPTY_SC  # Score 0
 
     def visit_token(self, level, node):
         """ At token node """
         # Return the score of this token/terminal match
-        d = dict()
-        sc = self._scores[node.start][node.terminal]
-        if node.terminal.matches_category("fs"):
+        is_prep = node.terminal.matches_category("fs")
+        prep_bonus = self.get_prep_bonus() if is_prep else None
+        key = (node.start, node.terminal, prep_bonus)
+        d = self._token_cache.get(key)
+        if d is not None:
+            # Already calculated: the result dict is never modified
+            # by the caller, so it can be shared
+            node.score = d["sc"]
+            return d
+        d = self._token_cache[key] = dict()
+        sc = self._scores[node.start - self._offset][node.terminal._index]
+        if is_prep:
             # Preposition terminal - this is either a normal fs_case terminal
             # or a literal terminal such as "á:fs"
-            prep_bonus = self.get_prep_bonus()
             if prep_bonus is not None:
                 # We are inside a preposition bonus zone:
                 # give bonus points if this preposition terminal matches
                 # an enclosing verb
                 # Iterate through enclosing verbs
                 final_bonus = None
+                prep_terminal = node.terminal
+                prep_token = node.token.lower
+                prep_key = (prep_terminal, prep_token)
+                prep_with_case = None
+                bonus_cache = self._bonus_cache
                 # pylint: disable=not-an-iterable
-                for terminal, token in prep_bonus:
+                for verb_key in prep_bonus:
                     # Attempt to find the preposition matching bonus in the cache
-                    key = (node.terminal, node.token.lower, terminal, token)
-                    bonus = self._bonus_cache.get(key)
+                    verb_cache = bonus_cache.get(verb_key)
+                    if verb_cache is None:
+                        verb_cache = bonus_cache[verb_key] = dict()
+                    bonus = verb_cache.get(prep_key)
                     if bonus is None:
-                        bonus = self._bonus_cache[key] = self.verb_prep_bonus(*key)
+                        # Not found: resolve the verb and the preposition
+                        # strings, each only once, and look up the bonus
+                        if prep_with_case is None:
+                            prep_with_case = self.prep_with_case(
+                                prep_terminal, prep_token
+                            )
+                        verb_with_cases = self._verb_cache.get(verb_key)
+                        if verb_with_cases is None:
+                            verb_with_cases = self.verb_with_cases(*verb_key)
+                            self._verb_cache[verb_key] = verb_with_cases
+                        bonus = verb_cache[prep_key] = self.match_bonus(
+                            verb_with_cases, prep_with_case
+                        )
                     if bonus is not None:
                         # Found a bonus, which can be positive or negative
                         if final_bonus is None:
@@ -417,16 +737,13 @@ class ParseForestReducer(ParseForestNavigator):
     def process_results(self, results, node):
         """ Sort scores after visiting children, then prune the child families
             (productions) leaving only the top-scoring family (production) """
-        d = dict(sc=0) if results is None else results.process(node)
+        d = _EMPTY_SC if results is None else results.process(node)
         node.score = d["sc"]
         return d
 
     def _check_stacks(self):
         """ Runtime sanity check of the reducer stacks """
-        assert len(self._prep_bonus_stack) == 1 and self._prep_bonus_stack[0] is None
-        assert (
-            len(self._current_verb_stack) == 1 and self._current_verb_stack[0] is None
-        )
+        assert len(self._ctx_stack) == 1 and self._ctx_stack[0] == [None, None]
 
     def go(self, root_node):
         """ Perform the reduction, but first split the tree underneath
@@ -435,27 +752,74 @@ class ParseForestReducer(ParseForestNavigator):
         PrepositionUnpacker.navigate(root_node)
         # ParseForestPrinter.print_forest(root_node, skip_duplicates = True)
         # Start normal navigation of the tree after the split
-        result = super().go(root_node)
+        result = self._walk(root_node)
         self._check_stacks()  # !!! DEBUG
         return result
 
+    def _walk(self, root_node):
+        """ Navigate the forest from the root node, calculating scores
+            and reducing ambiguous nodes. This is equivalent to
+            ParseForestNavigator.go() with the visit_*(), add_result()
+            and process_results() methods above inlined, and without
+            the level and child index bookkeeping, which the reducer
+            doesn't use. The walk is the hot loop of the reducer. """
+
+        visited = dict()
+        visit_token = self.visit_token
+
+        def _walk_helper(w):
+            # All results are dicts, so None means 'not visited yet'
+            v = visited.get(w)
+            if v is not None:
+                return v
+            if w is None:
+                # Epsilon node
+                v = _EMPTY_SC
+            elif w._token is not None:
+                v = visit_token(0, w)
+            elif w.is_span:
+                results = ReductionInfo(self, w)
+                add_child_score = results.add_child_score
+                for ix, (prod, children) in enumerate(w._families):
+                    results.add_child_production(ix, prod)
+                    for ch in children:
+                        add_child_score(ix, _walk_helper(ch))
+                v = results.process(w)
+                w.score = v["sc"]
+            else:
+                # Empty node: visit the children, but ignore their results
+                for _, children in w._families:
+                    for ch in children:
+                        _walk_helper(ch)
+                v = _EMPTY_SC
+                w.score = 0
+            visited[w] = v
+            return v
+
+        return _walk_helper(root_node)
+
 
 class OptionFinder(ParseForestNavigator):
 
-    """ Subclass to navigate a parse forest and populate the set
-        of terminals that match each token """
+    """ Subclass to navigate a parse forest and populate the dict
+        of terminals (by index) that match each token, with zero
+        initial scores """
 
     def visit_token(self, level, node):
         """ At token node """
         # assert node.terminal is not None
-        self._finals[node.start].add(node.terminal)
-        self._tokens[node.start] = node.token
+        ix = node.start - self._offset
+        self._finals[ix][node.terminal._index] = 0
+        self._tokens[ix] = node.token
         return None
 
-    def __init__(self, finals, tokens):
+    def __init__(self, finals, tokens, offset=0):
         super().__init__()
+        # The finals and tokens lists are indexed by token
+        # position relative to the given offset
         self._finals = finals
         self._tokens = tokens
+        self._offset = offset
 
 
 class Reducer:
@@ -464,152 +828,202 @@ class Reducer:
 
     def __init__(self, grammar):
         self._grammar = grammar
+        # Information about each terminal of the grammar,
+        # indexed by terminal index for fast lookup
+        self._terminal_info = _grammar_terminal_info(grammar)
+        # Cache of terminal scores for token sequences that have been seen
+        # before. The scores are only read by ParseForestReducer and can
+        # thus be shared. The cache belongs to this reducer, and thereby
+        # to its grammar, so it does not keep other grammars alive.
+        # Each entry holds the token keys and terminal option sets of a
+        # sentence, along with its score dicts: typically around 5 KB,
+        # or some 5 MB for a full cache of _SCORE_CACHE_SIZE entries.
+        self._score_cache = LFU_Cache(maxsize=_SCORE_CACHE_SIZE)
 
     def _find_options(self, forest, finals, tokens):
         """ Find token-terminal match options in a parse forest with a root in w """
-        OptionFinder(finals, tokens).go(forest)
+        OptionFinder(finals, tokens, forest.start).go(forest)
 
     def _calc_terminal_scores(self, w):
         """ Calculate the score for each possible terminal/token match """
 
         # First pass: for each token, find the possible terminals that
         # can correspond to that token
-        finals = defaultdict(set)
-        tokens = dict()
+        # (the lists are indexed by token position relative to w.start,
+        # and each token's terminal options are kept in a dict
+        # that doubles as the token's score dict)
+        start = w.start
+        finals = [dict() for _ in range(start, w.end)]
+        tokens = [None] * (w.end - start)
         self._find_options(w, finals, tokens)
 
+        # The scores only depend on the tokens and their terminal options,
+        # so identical sentences (or sentence fragments) get identical scores
+        key = (
+            start,
+            tuple((token.key, frozenset(s)) for token, s in zip(tokens, finals)),
+        )
+        # The scores are calculated outside the cache lock,
+        # so that parallel parses don't wait for each other
+        cache = self._score_cache
+        scores = cache.get(key)
+        if scores is None:
+            scores = self._calc_option_scores(start, finals, tokens)
+            cache.put(key, scores)
+        return scores
+
+    def _calc_option_scores(self, start, finals, tokens):
+        """ Calculate the scores of the terminal options for the tokens
+            starting at the given index """
+
         # Second pass: find a (partial) ordering by scoring
-        # the terminal alternatives for each token
-        scores = dict()
+        # the terminal alternatives for each token, keyed by terminal index.
+        # Initially, each alternative has a score of 0. The finals dicts
+        # are freshly created for this calculation, so they are
+        # updated in place instead of being copied.
+        scores = finals
         noun_prefs = NounPreferences.DICT
+        tinfo = self._terminal_info
 
         # Loop through the indices of the tokens spanned by this tree
-        for i in range(w.start, w.end):
-
-            s = finals[i]
-            # Initially, each alternative has a score of 0
-            scores[i] = {terminal: 0 for terminal in s}
+        for i, s in enumerate(finals, start):
 
             if len(s) <= 1:
                 # No ambiguity to resolve here
                 continue
 
-            token = tokens[i]
+            token = tokens[i - start]
             # More than one terminal in the option set for the token at index i
             # Calculate the relative scores
             # Find out whether the first part of all the terminals are the same
-            same_first = len(set(terminal.first for terminal in s)) == 1
+            same_first = len(set(tinfo[tix].first for tix in s)) == 1
             txt = txt_last = token.lower
+            t2 = token.t2
+            is_word = token.is_word
+            is_upper = token.is_upper
             composite = False
             # Get the last part of a composite word (e.g. 'jaðar-áhrifin' -> 'áhrifin')
-            if token.is_word and token.t2 and "-" in token.t2[0].ordmynd:
+            if is_word and t2 and "-" in t2[0].ordmynd:
                 composite = True
-                txt_last = token.t2[0].ordmynd.rsplit("-", maxsplit=1)[-1]
+                txt_last = t2[0].ordmynd.rsplit("-", maxsplit=1)[-1]
             # No need to check preferences if the first parts of
             # all possible terminals are equal
             # Look up the preference ordering from Reynir.conf, if any
             prefs = None if same_first else Preferences.get(txt_last)
-            sc = scores[i]
+            sc = scores[i - start]
             if prefs:
                 adj_worse = defaultdict(int)
                 adj_better = defaultdict(int)
                 for worse, better, factor in prefs:
-                    for wt in s:
-                        if wt.first in worse:
-                            for bt in s:
-                                if wt is not bt and bt.first in better:
-                                    if bt.is_literal:
-                                        # Literal terminal:
-                                        # be even more aggressive in promoting it
-                                        adj_w = -2 * factor
-                                        adj_b = +6 * factor
-                                    else:
-                                        adj_w = -2 * factor
-                                        adj_b = +4 * factor
-                                    adj_worse[wt] = min(adj_worse[wt], adj_w)
-                                    adj_better[bt] = max(adj_better[bt], adj_b)
+                    # Find the terminals in the worse and better categories
+                    wts = [tix for tix in s if tinfo[tix].first in worse]
+                    if not wts:
+                        continue
+                    bts = [tix for tix in s if tinfo[tix].first in better]
+                    if not bts:
+                        continue
+                    # Each worse terminal is demoted if there is a different
+                    # better terminal, and vice versa
+                    adj_w = -2 * factor
+                    for wt in wts:
+                        if len(bts) > 1 or bts[0] != wt:
+                            adj_worse[wt] = min(adj_worse[wt], adj_w)
+                    for bt in bts:
+                        if len(wts) > 1 or wts[0] != bt:
+                            # Literal terminal:
+                            # be even more aggressive in promoting it
+                            adj_b = (6 if tinfo[bt].is_literal else 4) * factor
+                            adj_better[bt] = max(adj_better[bt], adj_b)
                 for wt, adj in adj_worse.items():
                     sc[wt] += adj
                 for bt, adj in adj_better.items():
                     sc[bt] += adj
 
+            # Calculate token-level conditions used by the heuristics below
+            # Is this an uppercase word that can be a person or entity name?
+            is_personlike = (
+                is_word and is_upper and t2 and any(m.fl in _PERSON_FL for m in t2)
+            )
+            # Is there an nhm terminal option for the previous token?
+            nhm_prev = (i > start) and any(
+                tinfo[ptix].first == "nhm" for ptix in finals[i - start - 1]
+            )
+            # Is there a no_ef_ft terminal option for this token?
+            no_ef_ft = any(
+                pti.first == "no" and pti.vbits & _VBIT_EF and pti.is_plural
+                for pti in (tinfo[ptix] for ptix in s)
+            )
+            # The verb meanings of the token, and whether none of them
+            # allows zero arguments (calculated on demand, for verb terminals)
+            verb_meanings = None
+            no_zero_args = None
+
             # Apply heuristics to each terminal that potentially matches this token
-            for t in s:
-
-                if t.is_literal:
-                    # Give a bonus for exact or semi-exact matches with
-                    # literal terminals
-                    sc[t] += 2
-
-                tfirst = t.first
-                if tfirst == "ao" or tfirst == "eo":
-                    # Subtract from the score of all ao and eo
-                    sc[t] -= 1
-                elif tfirst == "no":
-                    if t.is_singular:
-                        # Add to singular nouns relative to plural ones
-                        sc[t] += 1
-                    elif t.is_abbrev:
-                        # Punish abbreviations in favor of other more specific terminals
-                        sc[t] -= 1
-                    if token.is_word and token.is_upper and token.t2:
+            for tix in s:
+
+                ti = tinfo[tix]
+                # Accumulate the score adjustment in a local variable,
+                # starting with the part that only depends on the terminal itself
+                delta = ti.fixed_score
+
+                rule = ti.rule
+                if rule is None:
+                    # No token-dependent heuristics for this terminal
+                    pass
+                elif rule == "no":
+                    if is_personlike:
                         # Punish connection of normal noun terminal to
                         # an uppercase word that can be a person or entity name
-                        if any(
-                            m.fl in {"ism", "erm", "nafn", "föð", "móð", "örn", "fyr"}
-                            for m in token.t2
-                        ):
-                            # logging.info(
-                            #     "Punishing connection of {0} with 'no' terminal"
-                            #     .format(tokens[i].t1))
-                            sc[t] -= 5
+                        # logging.info(
+                        #     "Punishing connection of {0} with 'no' terminal"
+                        #     .format(tokens[i].t1))
+                        delta -= 5
                     # Noun priorities, i.e. between different genders
                     # of the same word form (for example "ára" which can refer to
                     # three stems with different genders)
-                    if txt_last in noun_prefs:
-                        np = noun_prefs[txt_last].get(t.gender, 0)
-                        sc[t] += np
-                elif tfirst == "fs":
-                    if t.has_variant("nf"):
-                        # Reduce the weight of the 'artificial' nominative prepositions
-                        # 'næstum', 'sem', 'um'
-                        # Make other cases outweigh the Nl_nf bonus of +4 (-2 -3 = -5)
-                        sc[t] -= 8
-                    elif txt == "við" and t.has_variant("þgf"):
+                    if ti.gender_index is not None:
+                        np = noun_prefs.get(txt_last)
+                        if np is not None:
+                            delta += np[ti.gender_index]
+                elif rule == "fs":
+                    if txt == "við" and ti.vbits & _VBIT_THGF:
                         # Smaller bonus for við + þgf (is rarer than við + þf)
-                        sc[t] += 1
-                    elif txt == "sem" and t.has_variant("þf"):
-                        sc[t] -= 4
-                    elif txt == "á" and t.has_variant("þgf"):
+                        delta += 1
+                    elif txt == "sem" and ti.vbits & _VBIT_THF:
+                        delta -= 4
+                    elif txt == "á" and ti.vbits & _VBIT_THGF:
                         # Larger bonus for á + þgf to resolve conflict with verb 'eiga'
-                        sc[t] += 4
+                        delta += 4
                     else:
                         # Else, give a bonus for each matched preposition
-                        sc[t] += 2
-                elif tfirst == "lo":
+                        delta += 2
+                elif rule == "lo":
                     if composite:
                         # If this is a composite word, it's less likely
                         # to be an adjective, so give it a penalty
-                        sc[t] -= 3
-                elif tfirst == "so":
-                    if t.num_variants > 0 and t.variant(0) in "012":
+                        delta -= 3
+                elif rule == "so":
+                    if ti.num_variants > 0 and ti.var0 in "012":
+                        if verb_meanings is None:
+                            verb_meanings = [m for m in t2 if m.ordfl == "so"]
                         # Consider verb arguments
                         # Normally, we give a bonus for verb arguments:
                         # the more matched, the better
-                        numcases = int(t.variant(0))
+                        numcases = int(ti.var0)
                         adj = 2 * numcases
                         # !!! TODO: Logic should be added here to encourage
                         # zero arguments for verbs in the middle voice
                         if numcases == 0:
                             # Zero arguments: we might not like this
-                            vo0 = VerbObjects.VERBS[0]
-                            if all(
-                                (m.stofn not in vo0)
-                                and (m.ordmynd not in vo0)
-                                and ("MM" not in m.beyging)
-                                for m in token.t2
-                                if m.ordfl == "so"
-                            ):
+                            if no_zero_args is None:
+                                vo0 = VerbObjects.VERBS[0]
+                                no_zero_args = all(
+                                    (m.stofn not in vo0)
+                                    and (m.ordmynd not in vo0)
+                                    and ("MM" not in m.beyging)
+                                    for m in verb_meanings
+                                )
+                            if no_zero_args:
                                 # No meaning where the verb has zero arguments
                                 adj = -5
                         # Apply score adjustments for verbs with particular
@@ -617,115 +1031,59 @@ class Reducer:
                         # In the (rare) cases where there are conflicting scores,
                         # apply the most positive adjustment
                         adjmax = 0
-                        for m in token.t2:
-                            if m.ordfl == "so":
-                                key = m.stofn + t.verb_cases
-                                score = VerbObjects.SCORES.get(key)
-                                if score is not None:
-                                    adjmax = score
-                                    break
-                        sc[t] += adj + adjmax
-                    if t.is_bh:
-                        # Discourage 'boðháttur'
-                        sc[t] -= 4
-                    elif t.is_sagnb:
-                        # We like sagnb and lh, it means that more
-                        # than one piece clicks into place
-                        sc[t] += 6
-                    elif t.is_lh:
-                        # sagnb is preferred to lh, but vb (veik beyging) is discouraged
-                        if t.has_variant("vb"):
-                            sc[t] -= 2
-                        else:
-                            sc[t] += 3
-                    elif t.is_lh_nt:
-                        sc[t] += 12  # Encourage LHNT rather than LO
-                    elif t.is_mm:
-                        # Encourage mm forms. The encouragement should be better than
-                        # the score for matching a single case, so we pick so_0_mm
-                        # rather than so_1_þgf, for instance.
-                        sc[t] += 3
-                    elif t.is_vh:
-                        # Encourage vh forms
-                        sc[t] += 2
-                    if t.is_subj:
-                        # Give a small bonus for subject matches
-                        if t.has_variant("none"):
-                            # ... but a punishment for subj_none
-                            sc[t] -= 3
-                        else:
-                            sc[t] += 1
-                    if t.is_nh:
-                        if (i > 0) and any(pt.first == "nhm" for pt in finals[i - 1]):
+                        for m in verb_meanings:
+                            key = (m.stofn, ti.verb_cases)
+                            score = VerbObjects.SCORES.get(key)
+                            if score is not None:
+                                adjmax = score
+                                break
+                        delta += adj + adjmax
+                    if ti.is_nh:
+                        if nhm_prev:
                             # Give a bonus for adjacent nhm + so_nh terminals
-                            sc[t] += 4  # Prop up the verb terminal with the nh variant
-                            for pt in scores[i - 1].keys():
-                                if pt.first == "nhm":
+                            delta += 4  # Prop up the verb terminal with the nh variant
+                            prev_sc = scores[i - start - 1]
+                            for ptix in prev_sc.keys():
+                                if tinfo[ptix].first == "nhm":
                                     # Prop up the nhm terminal
-                                    scores[i - 1][pt] += 2
+                                    prev_sc[ptix] += 2
                                     break
-                        if any(
-                            pt.first == "no" and pt.has_variant("ef") and pt.is_plural
-                            for pt in s
-                        ):
+                        if no_ef_ft:
                             # If this is a so_nh and an alternative no_ef_ft exists,
                             # choose this one (for example, 'hafa', 'vera', 'gera',
                             # 'fara', 'mynda', 'berja', 'borða')
-                            sc[t] += 4
-                    if (i > 0) and token.is_upper:
+                            delta += 4
+                    if (i > 0) and is_upper:
                         # The token is uppercase and not at the start of a sentence:
                         # discourage it from being a verb
-                        sc[t] -= 4
-                elif tfirst == "tala":
-                    if t.has_variant("ef"):
-                        # Try to avoid interpreting plain numbers as possessive phrases
-                        sc[t] -= 4
-                elif tfirst == "person":
-                    if t.has_variant("nf"):
-                        # Prefer person names in the nominative case
-                        sc[t] += 2
-                elif tfirst == "sérnafn":
-                    if not token.t2:
+                        delta -= 4
+                elif rule == _SERNAFN:
+                    if not t2:
                         # If there are no BÍN meanings, we had no choice but
                         # to use sérnafn, so alleviate some of the penalty given
                         # by the grammar
-                        sc[t] += 12
+                        delta += 12
                     else:
-                        # BÍN meanings are available: discourage this
+                        # BÍN meanings are available: discourage this,
+                        # and further so for the first token in the sentence
                         # print(f"Discouraging sérnafn {txt}, "
                         #     "BÍN meanings are {tokens[i].t2}")
-                        sc[t] -= 10
-                        if i == w.start:
-                            # First token in sentence, and we have BÍN meanings:
-                            # further discourage this
-                            sc[t] -= 6
-                elif tfirst == "fyrirtæki":
-                    # We encourage company names to be interpreted as such,
-                    # so we give company abbreviations ('hf.', 'Corp.', 'Limited')
-                    # a high priority
-                    sc[t] += 24
-                elif tfirst == "st" or (tfirst == "sem" and t.colon_cat == "st"):
+                        delta -= 16 if i == start else 10
+                elif rule == "st":
                     if txt == "sem":
                         # Discourage "sem" as a pure conjunction (samtenging)
                         # (it does not get a penalty when occurring as
                         # a connective conjunction, 'stt')
-                        sc[t] -= 6
-                elif tfirst == "abfn":
-                    # If we have number and gender information with the reflexive
-                    # pronoun, that's good: encourage it
-                    sc[t] += 6 if t.num_variants > 1 else 2
-                elif tfirst == "gr":
-                    # Encourage separate definite article rather than pronoun
-                    sc[t] += 2
-                elif tfirst == "nhm":
-                    # Encourage the infinitive
-                    sc[t] += 4
+                        delta -= 6
+
+                if delta:
+                    sc[tix] += delta
 
         return scores
 
     def _reduce(self, w, scores):
         """ Reduce a forest with a root in w based on subtree scores """
-        return ParseForestReducer(self._grammar, scores).go(w)
+        return ParseForestReducer(self._grammar, scores, w.start).go(w)
 
     def go_with_score(self, forest):
         """ Returns the argument forest after pruning it down to a single tree """
@@ -27,16 +27,51 @@
 """
 
 import time
+import math
 from threading import Lock
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from tokenizer import correct_spaces, paragraphs, mark_paragraphs
 
 from .bintokenizer import tokenize as bin_tokenize
 from .fastparser import Fast_Parser, ParseError
-from .reducer import Reducer
-from .cache import cached_property
-from .matcher import SimpleTree
+from .cache import LFU_Cache
+
+# The reducer and matcher modules are imported lazily, when
+# the first sentence is parsed, to keep tokenize-only use light
+
+
+# Maximum number of simplified trees cached per job
+_SIMPLIFY_CACHE_SIZE = 2048
+
+
+def _tree_key(tree):
+    """ Return a hashable key that identifies a deep parse tree by its
+        structure, its terminals and the contents of its tokens,
+        or None if the tree cannot be keyed """
+    key = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        token = node._token
+        if token is not None:
+            key.append((node._start, node._terminal, token.t0, token.t1, token.t2))
+        else:
+            key.append((node._start, node._end, node._nonterminal, node._completed))
+            if node._families:
+                # After reduction, there is only one family of children
+                for _, children in node._families:
+                    stack.extend(reversed(children))
+    key = tuple(key)
+    try:
+        hash(key)
+    except TypeError:
+        # Some token contains unhashable auxiliary information
+        return None
+    return key
 
 
 # The Sentence.terminals attribute returns a list of Terminal objects
@@ -54,6 +89,12 @@ class _Sentence:
         sentence.parse(). After parsing, a number of query functions
         are available on the parse tree. """
 
+    __slots__ = (
+        "_job", "_s", "_len", "_err_index", "_tree", "_simplified_tree",
+        "_num", "_score", "_text", "_terminals", "_terminal_list",
+        "_terminal_nodes", "_ifd_tags",
+    )
+
     def __init__(self, job, s):
         self._job = job
         # s is a token list
@@ -64,7 +105,11 @@ class _Sentence:
         self._tree = self._simplified_tree = None
         self._num = None  # Number of possible combinations
         self._score = None  # Score of best parse tree
-        self._terminals = None  # Cached terminals
+        self._text = None  # Cached text
+        self._terminals = None  # Cached terminal data
+        self._terminal_list = None  # Cached Terminal tuples
+        self._terminal_nodes = None  # Cached terminal nodes
+        self._ifd_tags = None  # Cached IFD tags
         if self._job.parse_immediately:
             # We want an immediate parse of the sentence
             self.parse()
@@ -92,7 +137,7 @@ class _Sentence:
             self._simplified_tree = None
         else:
             # Create a simplified tree as well
-            self._simplified_tree = SimpleTree.from_deep_tree(tree, self._s)
+            self._simplified_tree = job.simplify(tree, self._s)
         self._num = num
         self._score = score
         return num > 0
@@ -135,11 +180,13 @@ class _Sentence:
         """ Return a flat text representation of the simplified parse tree """
         return None if self.tree is None else self.tree.flat
 
-    @cached_property
+    @property
     def text(self):
         """ Return a raw text representation of the sentence,
             with spaces between all tokens """
-        return " ".join(t.txt for t in self._s if t.txt)
+        if self._text is None:
+            self._text = " ".join([t.txt for t in self._s if t.txt])
+        return self._text
 
     @property
     def tidy_text(self):
@@ -149,9 +196,32 @@ class _Sentence:
             txt = self.text
         else:
             # Use the terminal text representation - it's got fancy em/en-dashes and stuff
-            txt = " ".join(t.text for t in self.terminals)
+            txt = " ".join(self._terminal_fields()[0])
         return correct_spaces(txt)
 
+    def _walk_once(self):
+        """ Traverse the simplified tree once, caching its terminal nodes
+            and the corresponding terminal data """
+        terminal_nodes = [d for d in self.tree.descendants if d.is_terminal]
+        self._terminal_nodes = terminal_nodes
+        # The terminal data is stored as parallel tuples of texts, lemmas,
+        # categories, variants and indices. Terminal tuples are only
+        # created if the terminals property is read.
+        self._terminals = (
+            tuple(d.text for d in terminal_nodes),
+            tuple(d.lemma for d in terminal_nodes),
+            tuple(d.tcat for d in terminal_nodes),
+            tuple(d.all_variants for d in terminal_nodes),
+            tuple(d.index for d in terminal_nodes),
+        )
+
+    def _terminal_fields(self):
+        """ Return the parallel tuples of terminal data, generating them
+            from the parse tree if necessary. The sentence must be parsed. """
+        if self._terminals is None:
+            self._walk_once()
+        return self._terminals
+
     @property
     def terminals(self):
         """ Return a list of tuples, one for each terminal in the sentence.
@@ -161,29 +231,29 @@ class _Sentence:
         if self.tree is None:
             # Must parse the sentence first, without errors
             return None
-        if self._terminals is not None:
-            # Already calculated and cached
-            return self._terminals
-        # Generate the terminal list from the parse tree
-        self._terminals = [
-            Terminal(d.text, d.lemma, d.tcat, d.all_variants, d.index)
-            for d in self.terminal_nodes
-        ]
-        return self._terminals
+        if self._terminal_list is None:
+            # Generate the terminal list from the cached terminal data
+            self._terminal_list = [
+                Terminal._make(t) for t in zip(*self._terminal_fields())
+            ]
+        return self._terminal_list
 
-    @cached_property
+    @property
     def terminal_nodes(self):
         """ Return a list of the terminal nodes within the parse tree
             for this sentence """
         if self.tree is None:
             return None
-        return [d for d in self.tree.descendants if d.is_terminal]
+        if self._terminal_nodes is None:
+            self._walk_once()
+        return self._terminal_nodes
 
     @property
     def lemmas(self):
         """ Convenience property to return the lemmas only """
-        t = self.terminals
-        return None if t is None else [terminal[1] for terminal in t]
+        if self.tree is None:
+            return None
+        return list(self._terminal_fields()[1])
 
     @property
     def ifd_tags(self):
@@ -191,9 +261,13 @@ class _Sentence:
             the terminals/tokens in this sentence. """
         if self.tree is None:
             return None
-        # Flatten the ifd_tags lists for the individual nodes
-        # (nonterminal nodes return an empty list in the ifd_tags property)
-        return [ifd_tag for d in self.tree.descendants for ifd_tag in d.ifd_tags]
+        if self._ifd_tags is None:
+            # Flatten the ifd_tags lists for the individual terminal nodes
+            # (nonterminal nodes have no IFD tags)
+            self._ifd_tags = [
+                ifd_tag for d in self.terminal_nodes for ifd_tag in d.ifd_tags
+            ]
+        return self._ifd_tags
 
     def __str__(self):
         return self.text
@@ -227,13 +301,24 @@ class _Job:
         by paragraph and/or sentence.
     """
 
-    def __init__(self, reynir, tokens, parse):
+    def __init__(self, reynir, tokens, parse, *, parallel=False, max_workers=None):
         self._r = reynir
         self._parser = self._r.parser
         self._reducer = self._r.reducer
         self._tokens = tokens
-        self._parse_time = 0.0
+        self._parse_time_ns = 0  # Integer nanoseconds
         self._parse = parse
+        # Parallel parsing only applies if sentences are parsed immediately
+        self._parallel = parallel and parse
+        self._max_workers = max_workers
+        # Protects the statistics, which may be updated from worker threads
+        self._lock = Lock()
+        # Simplified trees of previously seen deep trees, as nested
+        # dictionaries that can be shared by multiple SimpleTree objects
+        self._simplify_cache = LFU_Cache(maxsize=_SIMPLIFY_CACHE_SIZE)
+        # Idle Simplifier instances, reused for the sentences in the job.
+        # There is one for each thread that has simplified concurrently.
+        self._simplifiers = []
         self._num_sent = 0
         self._num_parsed = 0
         self._num_tokens = 0
@@ -241,20 +326,26 @@ class _Job:
         self._total_ambig = 0.0
         self._total_tokens = 0
 
-    def _add_sentence(self, s, num, parse_time):
+    def _add_sentence(self, s, num, parse_time_ns):
         """ Add a processed sentence to the statistics """
         slen = len(s)
-        self._num_sent += 1
-        self._num_tokens += slen
-        if num > 0:
-            # The sentence was parsed successfully
-            self._num_parsed += 1
-            self._num_combinations += num
-            ambig_factor = num ** (1 / slen)
-            self._total_ambig += ambig_factor * slen
-            self._total_tokens += slen
-        # Accumulate the time spent on parsing
-        self._parse_time += parse_time
+        with self._lock:
+            self._num_sent += 1
+            self._num_tokens += slen
+            if num > 0:
+                # The sentence was parsed successfully
+                self._num_parsed += 1
+                self._num_combinations += num
+                if num == 1:
+                    # Unambiguous sentence: the common case
+                    ambig_factor = 1.0
+                else:
+                    # Note that math.log() also copes with huge integers
+                    ambig_factor = math.exp(math.log(num) / slen)
+                self._total_ambig += ambig_factor * slen
+                self._total_tokens += slen
+            # Accumulate the time spent on parsing, in nanoseconds
+            self._parse_time_ns += parse_time_ns
 
     def _create_sentence(self, s):
         """ Create a fresh _Sentence object """
@@ -272,8 +363,24 @@ class _Job:
 
     def sentences(self):
         """ Yield the sentences from the token stream """
-        for p in self.paragraphs():
-            yield from p.sentences()
+        if self._parallel:
+            yield from self._parallel_sentences()
+            return
+        # Iterate directly through the paragraphs of the token stream,
+        # without wrapping them in _Paragraph objects
+        for p in paragraphs(self._tokens):
+            for _, sent in p:
+                yield self._create_sentence(sent)
+
+    def _parallel_sentences(self):
+        """ Yield the sentences from the token stream, in order, having
+            parsed them in a pool of worker threads. The parser and
+            reducer are re-entrant, and the parser releases the GIL
+            while it runs in the C++ core. """
+        sents = [sent for p in paragraphs(self._tokens) for _, sent in p]
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            # _create_sentence() parses the sentence immediately
+            yield from executor.map(self._create_sentence, sents)
 
     def parse(self, tokens):
         """ Parse the token sequence, returning a parse tree,
@@ -281,7 +388,7 @@ class _Job:
             score of the best tree """
         num = 0
         score = 0
-        t0 = time.time()
+        t0 = time.perf_counter_ns()
         try:
             forest = self.parser.go(tokens)  # May raise ParseError
             if forest is not None:
@@ -293,12 +400,40 @@ class _Job:
             return forest, num, score
         finally:
             # Accumulate statistics in the job object
-            self._add_sentence(tokens, num, time.time() - t0)
+            self._add_sentence(tokens, num, time.perf_counter_ns() - t0)
 
     def reduce(self, forest):
         """ Find the best parse tree and return it along with its score """
         return self.reducer.go_with_score(forest)
 
+    def simplify(self, tree, tokens):
+        """ Return a simplified tree corresponding to the given deep tree,
+            reusing the result for identical trees over identical tokens """
+        from .matcher import SimpleTree, Simplifier
+
+        key = _tree_key(tree)
+        if key is None:
+            return SimpleTree.from_deep_tree(tree, tokens)
+        cache = self._simplify_cache
+        result = cache.get(key)
+        if result is None:
+            # Simplify outside the cache lock, so that parallel jobs
+            # don't wait for each other. Taking an idle simplifier
+            # off the list is atomic, so each is used by one thread.
+            try:
+                s = self._simplifiers.pop()
+            except IndexError:
+                s = Simplifier(tokens)
+            else:
+                s.reset(tokens)
+            try:
+                s.go(tree)
+                result = s.result
+            finally:
+                self._simplifiers.append(s)
+            cache.put(key, result)
+        return SimpleTree([[result]])
+
     def __iter__(self):
         """ Allow easy iteration of sentences within this job """
         return iter(self.sentences())
@@ -343,7 +478,7 @@ class _Job:
     @property
     def parse_time(self):
         """ Total time spent on parsing during this job, in seconds """
-        return self._parse_time
+        return self._parse_time_ns / 1e9
 
 
 class Reynir:
@@ -408,6 +543,7 @@ class Reynir:
         """ Return the parser instance to be used """
         with self._lock:
             if Reynir._parser is None:
+                from .reducer import Reducer
                 # Initialize a singleton instance of the parser and the reducer.
                 # Both classes are re-entrant and thread safe.
                 Reynir._parser = Fast_Parser()
@@ -421,20 +557,27 @@ class Reynir:
         assert Reynir._reducer is not None
         return Reynir._reducer
 
-    def submit(self, text, parse=False, *, split_paragraphs=False):
+    def submit(
+        self, text, parse=False, *,
+        split_paragraphs=False, parallel=False, max_workers=None
+    ):
         """ Submit a text to the tokenizer and parser, yielding a job object.
             The paragraphs and sentences of the text can then be iterated
             through via the job object. If parse is set to True, the
             sentences are automatically parsed before being returned.
             Otherwise, they need to be explicitly parsed by calling
             sent.parse(). This is a more incremental, asynchronous
-            approach than Reynir.parse(). """
+            approach than Reynir.parse(). If parallel is also set to
+            True, iterating through the job's sentences parses them
+            in a pool of up to max_workers threads. """
         if split_paragraphs:
             # Original text consists of paragraphs separated by newlines:
             # insert paragraph separators before tokenization
             text = mark_paragraphs(text)
         tokens = self.tokenize(text)
-        return _Job(self, tokens, parse=parse)
+        return _Job(
+            self, tokens, parse=parse, parallel=parallel, max_workers=max_workers
+        )
 
     def parse(self, text):
         """ Convenience function to parse text synchronously and return
@@ -444,6 +587,34 @@ class Reynir:
         # Iterating through the sentences in the job causes
         # them to be parsed and their statistics collected
         sentences = [sent for sent in job]
+        return self._summary(job, sentences)
+
+    def parse_batch(self, texts, *, max_workers=None):
+        """ Convenience function to parse a batch of texts, yielding
+            a summary of each text, in order, as returned by Reynir.parse().
+            The texts are tokenized up front, and then the sentences
+            of all texts are parsed in a single pool of up to max_workers
+            threads, sharing the parser and reducer. """
+        jobs = [_Job(self, self.tokenize(text), parse=True) for text in texts]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Creating a sentence within a job having parse=True
+            # causes the sentence to be parsed immediately
+            futures = [
+                [
+                    executor.submit(job._create_sentence, sent)
+                    for p in paragraphs(job._tokens)
+                    for _, sent in p
+                ]
+                for job in jobs
+            ]
+            for job, job_futures in zip(jobs, futures):
+                sentences = [f.result() for f in job_futures]
+                yield self._summary(job, sentences)
+
+    @staticmethod
+    def _summary(job, sentences):
+        """ Return a summary of the given parsed sentences of a job,
+            along with the job's statistics """
         return dict(
             sentences=sentences,
             num_sentences=job.num_sentences,
@@ -32,25 +32,67 @@
 """
 
 import os
+import re
 import codecs
 import locale
 import threading
+from sys import intern
 
 from contextlib import contextmanager, closing
+from functools import lru_cache
 from collections import defaultdict
 from threading import Lock
-from pkg_resources import resource_stream
+from pkg_resources import resource_string
+
+try:
+    # PyICU is optional: if it is installed, it is used for collation
+    from icu import Collator, Locale as ICU_Locale
+except ImportError:
+    Collator = ICU_Locale = None
 
 
 # The sorting locale used by default in the changedlocale function
 _DEFAULT_SORT_LOCALE = ("IS_is", "UTF-8")
+# The C locale, whose collation order is simply by code point
+_BINARY_LOCALE = ("C", "")
+# Maximum number of cached sort keys for the default sorting locale
+_STRXFRM_CACHE_SIZE = 4096
+
+# The include directive in config files, matched case-insensitively,
+# capturing the name of the included file
+_INCLUDE_RE = re.compile(r"\$include\s+(.+)", re.IGNORECASE)
+# A nonblank config file line that is not a comment, capturing its content
+# without a trailing comment and without surrounding whitespace
+_CONFIG_LINE = re.compile(r"^[^\S\n]*([^#\s](?:[^#\n]*[^#\s])?)", re.MULTILINE)
 
 # A set of all valid verb argument cases
 _ALL_CASES = frozenset(("nf", "þf", "þgf", "ef"))
 _ALL_GENDERS = frozenset(("kk", "kvk", "hk"))
 _ALL_NUMBERS = frozenset(("et", "ft"))
 _SUBCLAUSES = frozenset(("nh", "mnh", "falls"))
+_EMPTY_SET = frozenset()
 _REFLPRN = {"sig": "sig_hk_et_þf", "sér": "sig_hk_et_þgf", "sín": "sig_hk_et_ef"}
+# Valid word categories for topic words
+_VALID_TOPIC_CATS = frozenset(
+    (
+        "kk",
+        "kvk",
+        "hk",
+        "lo",
+        "so",
+        "entity",
+        "person",
+        "person_kk",
+        "person_kvk",
+    )
+)
+# Valid final parts of compound verb arguments, such as "þf" in "sig_hk_et_þf"
+_VALID_ARG_SUFFIXES = _ALL_CASES | {"gr"}
+# The common preposition arguments in verb_objects, mapped to the form
+# in which they are stored. Other arguments are checked separately.
+_PREP_ARGS = dict(_REFLPRN)
+_PREP_ARGS.update((arg, arg) for arg in _ALL_CASES | _SUBCLAUSES)
+_PREP_ARGS.update((case + "_gr", case + "_gr") for case in _ALL_CASES)
 
 
 # Magic stuff to change locale context temporarily
@@ -58,8 +100,14 @@ _REFLPRN = {"sig": "sig_hk_et_þf", "sér": "sig_hk_et_þgf", "sín": "sig_hk_et
 
 @contextmanager
 def changedlocale(new_locale=None):
-    """ Change locale for collation temporarily within a context (with-statement) """
+    """ Change locale for collation temporarily within a context (with-statement).
+        Note that this changes the locale of the whole process: prefer
+        sort_strings(), which uses an ICU collator if PyICU is installed. """
     # The newone locale parameter should be a tuple: ('is_IS', 'UTF-8')
+    if new_locale == _BINARY_LOCALE:
+        # The C locale collates by code point: no need to change anything
+        yield str
+        return
     old_locale = locale.getlocale(locale.LC_COLLATE)
     try:
         locale.setlocale(locale.LC_COLLATE, new_locale or _DEFAULT_SORT_LOCALE)
@@ -68,11 +116,55 @@ def changedlocale(new_locale=None):
         locale.setlocale(locale.LC_COLLATE, old_locale)
 
 
-def sort_strings(strings, loc=None):
-    """ Sort a list of strings using the specified locale's collation order """
-    # Change locale temporarily for the sort
-    with changedlocale(loc) as strxfrm:
-        return sorted(strings, key=strxfrm)
+# Sort keys for the default sorting locale, which are reused
+# across calls to sort_strings(). This function must only be called
+# while the default sorting locale is in effect.
+_default_strxfrm = lru_cache(maxsize=_STRXFRM_CACHE_SIZE)(locale.strxfrm)
+
+
+# Serializes changes of the process locale in sort_strings(),
+# when PyICU is not available
+_LOCALE_LOCK = Lock()
+
+# Per-thread cache of ICU collators, keyed by ICU locale name.
+# Each thread gets its own collators, so no locking is needed.
+_TLS = threading.local()
+
+
+def _get_collator(loc=None):
+    """ Return a cached ICU collator for the given locale, which is
+        specified as for changedlocale(), e.g. ('IS_is', 'UTF-8') """
+    loc = loc or _DEFAULT_SORT_LOCALE
+    # Convert the locale specification to an ICU locale name, e.g. 'is_IS'
+    name = loc[0] if isinstance(loc, tuple) else loc.split(".")[0]
+    lang, _, country = name.partition("_")
+    name = lang.lower() + ("_" + country.upper() if country else "")
+    collators = getattr(_TLS, "collators", None)
+    if collators is None:
+        collators = _TLS.collators = dict()
+    collator = collators.get(name)
+    if collator is None:
+        collator = collators[name] = Collator.createInstance(ICU_Locale(name))
+    return collator
+
+
+def sort_strings(strings, loc=None, binary=False):
+    """ Sort a list of strings using the specified locale's collation order.
+        If binary is True, or the locale is ('C', ''), the strings are simply
+        sorted by code point, which is much faster. That is sufficient where
+        the order only needs to be deterministic and is not shown to users. """
+    if binary or loc == _BINARY_LOCALE:
+        return sorted(strings)
+    if Collator is not None:
+        # Use an ICU collator, which leaves the process locale alone
+        return sorted(strings, key=_get_collator(loc).getSortKey)
+    # Change locale temporarily for the sort. The locale is global
+    # to the process, so only one thread at a time may do this.
+    with _LOCALE_LOCK, changedlocale(loc) as strxfrm:
+        if loc is None:
+            return sorted(strings, key=_default_strxfrm)
+        # For other locales, only transform each distinct string once
+        return sorted(strings, key=lru_cache(maxsize=None)(strxfrm))
 
 
 class ConfigError(Exception):
@@ -98,9 +190,25 @@ class ConfigError(Exception):
         return "File {0}, line {1}: {2}".format(self.fname, self.line, s)
 
 
+def _peel_pragma(s, name):
+    """ Split a trailing pragma, such as $error(...) or $score(...),
+        off a config line. Returns a (line, pragma) tuple, where pragma
+        is the text within the parentheses, or None if the line has no
+        such pragma. """
+    before, sep, after = s.rpartition("$" + name + "(")
+    if not sep:
+        return s, None
+    # Config lines have already been stripped by LineReader
+    if after[-1:] != ")":
+        raise ConfigError("Missing right parenthesis in ${0}()".format(name))
+    return before.rstrip(), after[:-1].strip()
+
+
 class LineReader:
 
-    """ Read lines from a text file, recognizing $include directives """
+    """ Read lines from a text file, recognizing $include directives.
+        Blank lines and comments are skipped, and the lines are
+        returned without surrounding whitespace. """
 
     def __init__(self, fname, outer_fname=None, outer_line=0):
         self._fname = fname
@@ -119,34 +227,41 @@ class LineReader:
 
     def lines(self):
         """ Generator yielding lines from a text file """
-        self._line = 0
+        self._line = 1
         try:
+            # Read the entire file in one call and decode it from utf-8
+            # in bulk, leaving line endings untranslated
             if __package__:
-                stream = resource_stream(__name__, self._fname)
+                data = resource_string(__name__, self._fname)
             else:
-                stream = open(self._fname, "rb")
-            with stream as inp:
-                # Read config file line-by-line from the package resources
-                for b in inp:
-                    # We get byte strings; convert from utf-8 to strings
-                    s = b.decode("utf-8")
-                    self._line += 1
-                    # Check for include directive: $include filename.txt
-                    if s.startswith("$") and s.lower().startswith("$include "):
-                        iname = s.split(maxsplit=1)[1].strip()
-                        # Do some path magic to allow the included path
-                        # to be relative to the current file path, or a
-                        # fresh (absolute) path by itself
-                        head, _ = os.path.split(self._fname)
-                        iname = os.path.join(head, iname)
-                        rdr = self._inner_rdr = LineReader(
-                            iname, self._fname, self._line
-                        )
-                        for incl_s in rdr.lines():
-                            yield incl_s
-                        self._inner_rdr = None
-                    else:
-                        yield s
+                with open(self._fname, "rb") as f:
+                    data = f.read()
+            text = data.decode("utf-8")
+            # Scan the entire file for content lines in one go,
+            # skipping blank lines and comments
+            count = text.count
+            pos = 0
+            for m in _CONFIG_LINE.finditer(text):
+                # Keep track of the line number by counting the
+                # line breaks since the previous content line
+                start = m.start()
+                self._line += count("\n", pos, start)
+                pos = start
+                s = m.group(1)
+                # Check for include directive: $include filename.txt
+                inc = _INCLUDE_RE.match(s) if s[0] == "$" else None
+                if inc is not None:
+                    iname = inc.group(1)
+                    # Do some path magic to allow the included path
+                    # to be relative to the current file path, or a
+                    # fresh (absolute) path by itself
+                    head, _ = os.path.split(self._fname)
+                    iname = os.path.join(head, iname)
+                    rdr = self._inner_rdr = LineReader(iname, self._fname, self._line)
+                    yield from rdr.lines()
+                    self._inner_rdr = None
+                else:
+                    yield s
         except (IOError, OSError):
             if self._outer_fname:
                 # This is an include file within an outer config file
@@ -166,88 +281,112 @@ class LineReader:
             raise c
 
 
-class VerbObjects:
+def _verb_key(verb_with_cases):
+    """ Convert a string such as "fresta_þgf" to a VerbObjects
+        lexicon key, such as ("fresta", ("þgf",)) """
+    verb, _, cases = verb_with_cases.partition("_")
+    return (verb, tuple(cases.split("_")) if cases else ())
+
+
+class _VerbObjects:
 
     """ Wrapper around dictionary of verbs and their objects,
         initialized from the config file """
 
-    # Dictionary of verbs by object (argument) number, 0, 1 or 2
-    # Verbs can control zero, one or two arguments (noun phrases),
-    # where each argument must have a particular case
-    VERBS = [set(), defaultdict(list), defaultdict(list)]
-    # Dictionary of verb forms with associated scores
-    # The key is the normal form of the verb + the associated cases,
-    # separated by underscores, e.g. "vera_þgf_ef"
-    SCORES = dict()
-    # Dictionary of verbs where, for each verb + argument cases, we store a set of
-    # preposition_case keys, i.e. "frá_þgf"
-    PREPOSITIONS = defaultdict(set)
-
-    # dict { verb + argument cases : verb particle}
-    VERB_PARTICLES = defaultdict(set)
-
-    VERBS_ERRORS = [set(), defaultdict(dict), defaultdict(dict)]
-    VERB_PARTICLES_ERRORS = defaultdict(dict)
-    PREPOSITIONS_ERRORS = defaultdict(dict)
-    WRONG_VERBS = defaultdict(list)
+    __slots__ = (
+        "VERBS", "SCORES", "PREPOSITIONS", "VERB_PARTICLES",
+        "VERBS_ERRORS", "VERB_PARTICLES_ERRORS", "PREPOSITIONS_ERRORS", "WRONG_VERBS",
+        "_arglists_seen",
+    )
 
-    @staticmethod
-    def add(verb, args, prepositions, particle, score):
+    def __init__(self):
+        # Dictionary of verbs by object (argument) number, 0, 1 or 2
+        # Verbs can control zero, one or two arguments (noun phrases),
+        # where each argument must have a particular case
+        self.VERBS = [set(), defaultdict(list), defaultdict(list)]
+        # Set of (verb, argument tuple) pairs already added to VERBS,
+        # used to avoid duplicates while the config file is being read
+        self._arglists_seen = set()
+        # Dictionary of verb forms with associated scores
+        # The key is a tuple of the normal form of the verb and a tuple
+        # of the associated cases, e.g. ("vera", ("þgf", "ef"))
+        self.SCORES = dict()
+        # Dictionary of verbs where, for each (verb, argument cases) key,
+        # we store a set of preposition_case strings, i.e. "frá_þgf"
+        self.PREPOSITIONS = defaultdict(set)
+
+        # dict { (verb, argument cases) : verb particle }
+        self.VERB_PARTICLES = defaultdict(set)
+
+        # Information from $error() pragmas. As in the tables above, verbs
+        # with their argument cases are keyed by (verb, argument cases) tuples.
+        # VERBS_ERRORS is indexed by argument count, and maps each verb to
+        # a dict { (verb, argument cases) : error specification }
+        self.VERBS_ERRORS = [set(), defaultdict(dict), defaultdict(dict)]
+        self.VERB_PARTICLES_ERRORS = defaultdict(dict)
+        self.PREPOSITIONS_ERRORS = defaultdict(dict)
+        self.WRONG_VERBS = defaultdict(list)
+
+    def add(self, verb, args, prepositions, particle, score):
         """ Add a verb and its objects (arguments). Called from the config file handler. """
         la = len(args)
         if la > 2:
             raise ConfigError("A verb can have 0-2 arguments; {0} given".format(la))
+        # Intern the verb and its arguments, which recur across
+        # thousands of config lines
+        verb = intern(verb)
+        args = [intern(kind) for kind in args]
         if la:
             for kind in args:
                 if kind not in _ALL_CASES and kind not in _SUBCLAUSES:
                     if kind in _REFLPRN:
                         kind = _REFLPRN[kind]
                     else:
-                        spl = kind.split("_")
-                        if spl[-1] not in _ALL_CASES and spl[-1] != "gr":
+                        if kind.rpartition("_")[2] not in _VALID_ARG_SUFFIXES:
                             raise ConfigError(
                                 "Invalid verb argument: '{0}'".format(kind)
                             )
-            # Append a possible argument list
-            arglists = VerbObjects.VERBS[la][verb]
-            if args not in arglists:
-                # Avoid adding the same argument list twice
-                arglists.append(args)
+            # Append a possible argument list,
+            # avoiding adding the same argument list twice
+            key = (verb, tuple(args))
+            if key not in self._arglists_seen:
+                self._arglists_seen.add(key)
+                self.VERBS[la][verb].append(args)
         else:
             # Note that the verb can be argument-free
-            VerbObjects.VERBS[0].add(verb)
+            self.VERBS[0].add(verb)
         # Store the score, if nonzero
-        verb_with_cases = "_".join([verb] + args)
+        verb_with_cases = (verb, tuple(args))
         if score != 0:
-            VerbObjects.SCORES[verb_with_cases] = score
+            self.SCORES[verb_with_cases] = score
         # prepositions is a list of tuples: (preposition, case/kind), e.g. ("í", "þgf") or ("í", "falls")
-        d = VerbObjects.PREPOSITIONS[verb_with_cases]
+        d = self.PREPOSITIONS[verb_with_cases]
         for p, kind in prepositions:
             # Add a "bare" preposition, such as "í"
-            d.add(p)
+            d.add(intern(p))
             # Add a full form with case or argument kind, such as "í_þgf", or "í_nh"
-            d.add(p + "_" + kind)
+            d.add(intern(p + "_" + kind))
         if particle:
-            VerbObjects.VERB_PARTICLES[verb_with_cases] = particle
+            self.VERB_PARTICLES[verb_with_cases] = particle
 
-    @staticmethod
-    def add_error(verb, args, prepositions, particle, corr):
+    def add_error(self, verb, args, prepositions, particle, corr):
         """ Take note of a verb object specification with an $error pragma """
         corrlist = corr.split(",")
         errlist = corrlist[0].split("-")
         errkind = errlist[0].strip()
-        verb_with_cases = "_".join([verb] + args)
+        verb = intern(verb)
+        verb_with_cases = (verb, tuple(intern(kind) for kind in args))
         if errkind == "OBJ":
-            arglists = VerbObjects.VERBS_ERRORS[len(args)][verb]
+            arglists = self.VERBS_ERRORS[len(args)][verb]
             arglists[verb_with_cases] = corr
         elif errkind == "PP":
-            d = VerbObjects.PREPOSITIONS_ERRORS[verb_with_cases]
+            d = self.PREPOSITIONS_ERRORS[verb_with_cases]
             for p, kind in prepositions:
                 d[p] = corr
                 d[p + "_" + kind] = corr
         elif errkind == "PRTCL":
             # !!! TODO: Parse the corr string
-            VerbObjects.VERB_PARTICLES_ERRORS[verb_with_cases][particle] = corr
+            self.VERB_PARTICLES_ERRORS[verb_with_cases][particle] = corr
         elif errkind == "ALL":
             # !!! TODO: Implement this (store specification of a
             # !!! TODO: replacement of the entire construct)
@@ -259,7 +398,7 @@ class VerbObjects:
             wrong_kind = errlist[1].strip()
             if wrong_kind == "VERB":
                 # Wrong verb, must point to completely different verb + args
-                VerbObjects.WRONG_VERBS[verb_with_cases] = corr
+                self.WRONG_VERBS[verb_with_cases] = corr
             elif wrong_kind == "OBJ":
                 # !!! TODO: Implement this
                 pass
@@ -270,54 +409,90 @@ class VerbObjects:
                 "Unknown error type in $error pragma: '{0}'".format(errkind)
             )
 
-    @staticmethod
-    def verb_matches_preposition(verb_with_cases, prep_with_case):
-        """ Does the given preposition with the given case fit the verb? """
+    def verb_matches_preposition(self, verb_with_cases, prep_with_case):
+        """ Does the given preposition with the given case fit the verb?
+            verb_with_cases is a (verb, cases) tuple, such as
+            ("fresta", ("þgf",)). A string such as "fresta_þgf" is also
+            accepted, for compatibility. The prepositions are interned,
+            so this is fastest if prep_with_case is interned as well
+            (cf. sys.intern()). """
+        if isinstance(verb_with_cases, str):
+            verb_with_cases = _verb_key(verb_with_cases)
         # if Settings.DEBUG:
         #    print("verb_matches_preposition: verb {0}, prep {1}, verb found {2}, prep found {3}"
         #        .format(verb_with_cases, prep_with_case,
-        #            verb_with_cases in VerbObjects.PREPOSITIONS,
-        #            verb_with_cases in VerbObjects.PREPOSITIONS and
-        #            prep_with_case in VerbObjects.PREPOSITIONS[verb_with_cases]))
-        return (
-            verb_with_cases in VerbObjects.PREPOSITIONS
-            and prep_with_case in VerbObjects.PREPOSITIONS[verb_with_cases]
-        )
+        #            verb_with_cases in self.PREPOSITIONS,
+        #            verb_with_cases in self.PREPOSITIONS and
+        #            prep_with_case in self.PREPOSITIONS[verb_with_cases]))
+        return prep_with_case in self.PREPOSITIONS.get(verb_with_cases, _EMPTY_SET)
 
-    @staticmethod
-    def verb_matches_particle(verb_with_cases, particle):
+    def verb_matches_particle(self, verb_with_cases, particle):
         """ Does the given particle fit the verb? """
-        return (
-            verb_with_cases in VerbObjects.VERB_PARTICLES
-            and particle in VerbObjects.VERB_PARTICLES[verb_with_cases]
-        )
+        if isinstance(verb_with_cases, str):
+            verb_with_cases = _verb_key(verb_with_cases)
+        particles = self.VERB_PARTICLES.get(verb_with_cases)
+        return particles is not None and particle in particles
+
+    def freeze(self):
+        """ Convert the verb tables to plain dicts with immutable values,
+            once the config file has been read """
+        verbs = self.VERBS
+        # Modify the VERBS list in place, since references to it
+        # are kept elsewhere (cf. BIN_Token._VERB_OBJECTS)
+        verbs[0] = frozenset(verbs[0])
+        for nargs in (1, 2):
+            verbs[nargs] = {
+                verb: tuple(tuple(args) for args in arglists)
+                for verb, arglists in verbs[nargs].items()
+            }
+        self.PREPOSITIONS = {
+            verb_with_cases: frozenset(preps)
+            for verb_with_cases, preps in self.PREPOSITIONS.items()
+        }
+        self.VERB_PARTICLES = dict(self.VERB_PARTICLES)
+        # Convert the error tables to plain dicts as well, so that
+        # lookups of missing keys cannot add empty entries to them
+        errors = self.VERBS_ERRORS
+        errors[0] = frozenset(errors[0])
+        errors[1] = dict(errors[1])
+        errors[2] = dict(errors[2])
+        self.VERB_PARTICLES_ERRORS = dict(self.VERB_PARTICLES_ERRORS)
+        self.PREPOSITIONS_ERRORS = dict(self.PREPOSITIONS_ERRORS)
+        self.WRONG_VERBS = dict(self.WRONG_VERBS)
+        # No more additions: the duplicate check is no longer needed
+        self._arglists_seen = None
+
+
+VerbObjects = _VerbObjects()
 
 
-class VerbSubjects:
+class _VerbSubjects:
 
     """ Wrapper around dictionary of verbs and their subjects,
         initialized from the config file """
 
-    # Dictionary of verbs and their associated set of subject cases
-    VERBS = defaultdict(set)
-    _CASE = "þgf"  # Default subject case
-    # dict { verb : (wrong_case, correct_case) }
-    VERBS_ERRORS = defaultdict(dict)
+    __slots__ = ("VERBS", "_CASE", "VERBS_ERRORS", "_IMPERSONAL")
 
-    @staticmethod
-    def set_case(case):
+    def __init__(self):
+        # Dictionary of verbs and their associated set of subject cases
+        self.VERBS = defaultdict(set)
+        self._CASE = "þgf"  # Default subject case
+        # dict { verb : (wrong_case, correct_case) }
+        self.VERBS_ERRORS = defaultdict(dict)
+        # Set of strictly impersonal verbs, filled in by freeze()
+        self._IMPERSONAL = frozenset()
+
+    def set_case(self, case):
         """ Set the case of the subject for the following verbs """
         # if case not in { "þf", "þgf", "ef", "none", "lhþt" }:
         #     raise ConfigError("Unknown verb subject case '{0}' in verb_subjects".format(case))
-        VerbSubjects._CASE = case
+        self._CASE = intern(case)
 
-    @staticmethod
-    def add(verb):
+    def add(self, verb):
         """ Add a verb and its arguments. Called from the config file handler. """
-        VerbSubjects.VERBS[verb].add(VerbSubjects._CASE)
+        self.VERBS[intern(verb)].add(self._CASE)
 
-    @staticmethod
-    def add_error(verb, corr):
+    def add_error(self, verb, corr):
         """ Add a verb and the correct case. Called from the config file handler. """
         corrlist = corr.split(",")
         errlist = corrlist[0].split("-")
@@ -328,7 +503,7 @@ class VerbSubjects:
             subj_type = errlist[1].strip()
             if subj_type == "CASE":
                 corr_case = corrlist[1].strip()
-                VerbSubjects.VERBS_ERRORS[verb][VerbSubjects._CASE] = corr_case
+                self.VERBS_ERRORS[verb][self._CASE] = corr_case
             else:
                 raise ConfigError(
                     "Unknown subject specification: 'SUBJ-{0}'".format(subj_type)
@@ -338,102 +513,177 @@ class VerbSubjects:
                 "Unknown error type in $error pragma: '{0}'".format(errkind)
             )
 
-    @staticmethod
-    def is_strictly_impersonal(verb):
+    def is_strictly_impersonal(self, verb):
         """ Returns True if the given verb is only impersonal, i.e. if it appears
             with an $error() pragma in the subject = nf section of verb_subjects
             and cannot be used with a nominative subject: ?'ég dreymdi þig' """
-        return "nf" in VerbSubjects.VERBS_ERRORS.get(verb, set())
+        return verb in self._IMPERSONAL
+
+    def freeze(self):
+        """ Precompute the set of strictly impersonal verbs,
+            once the config file has been read """
+        self.VERBS_ERRORS = dict(self.VERBS_ERRORS)
+        self._IMPERSONAL = frozenset(
+            verb for verb, errors in self.VERBS_ERRORS.items() if "nf" in errors
+        )
+
 
+VerbSubjects = _VerbSubjects()
 
-class Prepositions:
+
+class _Prepositions:
 
     """ Wrapper around dictionary of prepositions, initialized from the config file """
 
-    # Dictionary of prepositions: preposition -> { set of cases that it controls }
-    PP = defaultdict(set)
-    # Prepositions that can be followed by an infinitive verb phrase
-    # 'Beiðnin um að handtaka manninn var send lögreglunni'
-    PP_NH = set()
-    # A dictionary containing information from $error() pragmas associated
-    # with the preposition. Each entry is again a dict of {case: error} specifications,
-    # where each error spec is usually a tuple.
-    PP_ERRORS = defaultdict(dict)
+    __slots__ = ("PP", "PP_NH", "PP_ERRORS")
 
-    @staticmethod
-    def add(prep, case, nh):
+    def __init__(self):
+        # Dictionary of prepositions: preposition -> { set of cases that it controls }
+        self.PP = defaultdict(set)
+        # Prepositions that can be followed by an infinitive verb phrase
+        # 'Beiðnin um að handtaka manninn var send lögreglunni'
+        self.PP_NH = set()
+        # A dictionary containing information from $error() pragmas associated
+        # with the preposition. Each entry is again a dict of {case: error} specifications,
+        # where each error spec is usually a tuple.
+        self.PP_ERRORS = defaultdict(dict)
+
+    def add(self, prep, case, nh):
         """ Add a preposition and its case. Called from the config file handler. """
-        Prepositions.PP[prep].add(case)
+        prep = intern(prep)
+        self.PP[prep].add(intern(case))
         if nh:
-            Prepositions.PP_NH.add(prep)
+            self.PP_NH.add(prep)
 
-    @staticmethod
-    def add_error(prep, case, corr):
+    def add_error(self, prep, case, corr):
         """ Add an error correction entry for a preposition and a case.
             An error correction entry is usually a tuple. """
-        Prepositions.PP_ERRORS[prep][case] = corr
+        self.PP_ERRORS[prep][case] = corr
+
+    def freeze(self):
+        """ Convert the preposition tables to immutable values,
+            once the config file has been read """
+        self.PP = {prep: frozenset(cases) for prep, cases in self.PP.items()}
+        self.PP_NH = frozenset(self.PP_NH)
+        self.PP_ERRORS = dict(self.PP_ERRORS)
 
 
-class AdjectiveTemplate:
+Prepositions = _Prepositions()
+
+
+class _AdjectiveTemplate:
 
     """ Wrapper around template list of adjective endings """
 
-    # List of tuples: (ending, form_spec)
-    ENDINGS = []
+    __slots__ = ("ENDINGS",)
+
+    def __init__(self):
+        # List of tuples: (ending, form_spec)
+        self.ENDINGS = []
 
-    @classmethod
-    def add(cls, ending, form):
+    def add(self, ending, form):
         """ Add an adjective ending and its associated form. """
-        cls.ENDINGS.append((ending, form))
+        self.ENDINGS.append((ending, form))
+
+
+AdjectiveTemplate = _AdjectiveTemplate()
 
 
-class DisallowedNames:
+class _DisallowedNames:
 
     """ Wrapper around list of disallowed person name forms """
 
-    # Dictionary of name stems : sets of cases
-    STEMS = {}
+    __slots__ = ("STEMS",)
 
-    @classmethod
-    def add(cls, name, cases):
+    def __init__(self):
+        # Dictionary of name stems : sets of cases
+        self.STEMS = {}
+
+    def add(self, name, cases):
         """ Add an adjective ending and its associated form. """
-        cls.STEMS[name] = set(cases)
+        self.STEMS[name] = set(cases)
+
+
+DisallowedNames = _DisallowedNames()
 
 
-class UndeclinableAdjectives:
+class _UndeclinableAdjectives:
 
     """ Wrapper around list of undeclinable adjectives """
 
-    # Set of adjectives
-    ADJECTIVES = set()
+    __slots__ = ("ADJECTIVES",)
 
-    @classmethod
-    def add(cls, wrd):
+    def __init__(self):
+        # Set of adjectives
+        self.ADJECTIVES = set()
+
+    def add(self, wrd):
         """ Add an adjective """
-        cls.ADJECTIVES.add(wrd)
+        self.ADJECTIVES.add(wrd)
+
 
+UndeclinableAdjectives = _UndeclinableAdjectives()
 
-class StaticPhrases:
+
+def compile_phrase_trie(pdict):
+    """ Compile a phrase dictionary of the form
+        { firstword: [ (restword_list, phrase_index) ] } into a trie.
+        Each trie node is a (phrase_index, { nextword: [ node ] }) tuple,
+        where phrase_index is None if no phrase ends at the node.
+        The dict of the root node is returned. """
+
+    def node(phrases):
+        # The phrases share the same prefix and are in order of their index
+        ix = None
+        children = dict()
+        for rest, pix in phrases:
+            if rest:
+                children.setdefault(rest[0], []).append((rest[1:], pix))
+            elif ix is None:
+                # If the same phrase occurs more than once, the first one wins
+                ix = pix
+        return (ix, {w: [node(p)] for w, p in children.items()})
+
+    return {w: [node(phrases)] for w, phrases in pdict.items()}
+
+
+class _StaticPhrases:
 
     """ Wrapper around dictionary of static phrases, initialized from the config file """
 
-    # Default meaning for static phrases
-    MEANING = ("ao", "frasi", "-")
-    # Dictionary of the static phrases with their meanings
-    MAP = {}
-    # Dictionary of the static phrases with their IFD tags and lemmas
-    # { static_phrase : (tag string, lemma string) }
-    DETAILS = {}
-    # List of all static phrases and their meanings
-    LIST = []
-    # Parsing dictionary keyed by first word of phrase
-    DICT = defaultdict(list)
-    # Error dictionary, { phrase : (error_code, right_phrase, right_tag_string, right_lemma_string) }
-    ERROR_DICT = {}
+    __slots__ = (
+        "MEANING", "MAP", "DETAILS", "PHRASES", "MEANINGS", "LENGTHS",
+        "DICT", "TRIE", "ERROR_DICT", "_frozen",
+    )
 
-    @staticmethod
-    def add(spec):
+    def __init__(self):
+        # Default meaning for static phrases
+        self.MEANING = ("ao", "frasi", "-")
+        # Dictionary of the static phrases with their meanings
+        self.MAP = {}
+        # Dictionary of the static phrases with their IFD tags and lemmas
+        # { static_phrase : (tag string, lemma string) }
+        self.DETAILS = {}
+        # Parallel lists of all static phrases, their meanings
+        # and their lengths in words, indexed by phrase index.
+        # Each meaning is stored within a 1-tuple, i.e. as a ready-made
+        # meaning sequence for tokens (cf. get_meaning()).
+        self.PHRASES = []
+        self.MEANINGS = []
+        self.LENGTHS = []
+        # Parsing dictionary keyed by first word of phrase
+        self.DICT = {}
+        # The parsing dictionary compiled into a trie (see compile_phrase_trie())
+        self.TRIE = {}
+        # Error dictionary, { phrase : (error_code, right_phrase, right_tag_string, right_lemma_string) }
+        self.ERROR_DICT = {}
+        # Set by freeze(), after which no phrases can be added
+        self._frozen = False
+
+    def add(self, spec):
         """ Add a static phrase to the dictionary. Called from the config file handler. """
+        if self._frozen:
+            raise ConfigError("Static phrases cannot be added after the config is read")
         parts = spec.split(",")
         if len(parts) not in {1, 3}:
             raise ConfigError("Static phrase must include IFD tag list and lemmas")
@@ -445,22 +695,27 @@ class StaticPhrases:
 
         phrase = phrase[1:-1]
 
-        if phrase in StaticPhrases.MAP:
+        if phrase in self.MAP:
             raise ConfigError(
                 "Static phrase '{0}' is defined more than once".format(phrase)
             )
 
         # First add to phrase list
-        ix = len(StaticPhrases.LIST)
-        m = StaticPhrases.MEANING
+        ix = len(self.PHRASES)
+        m = self.MEANING
 
         mtuple = (phrase, 0, m[0], m[1], phrase, m[2])
 
-        # Append the phrase as well as its meaning in tuple form
-        StaticPhrases.LIST.append((phrase, mtuple))
+        # Split phrase into words
+        wlist = phrase.split()
+
+        # Append the phrase, its meaning in tuple form and its length
+        self.PHRASES.append(phrase)
+        self.MEANINGS.append((mtuple,))
+        self.LENGTHS.append(len(wlist))
 
         # Add to the main phrase dictionary
-        StaticPhrases.MAP[phrase] = mtuple
+        self.MAP[phrase] = mtuple
 
         # If details are supplied, store them
         if len(parts) == 3:
@@ -470,134 +725,165 @@ class StaticPhrases:
                 raise ConfigError("IFD tag list must be enclosed in double quotes")
             if len(lemmas) < 3 or lemmas[0] != '"' or lemmas[-1] != '"':
                 raise ConfigError("Lemmas must be enclosed in double quotes")
-            StaticPhrases.DETAILS[phrase] = (tags[1:-1], lemmas[1:-1])
+            self.DETAILS[phrase] = (tags[1:-1], lemmas[1:-1])
 
         # Dictionary structure: dict { firstword: [ (restword_list, phrase_index) ] }
 
-        # Split phrase into words
-        wlist = phrase.split()
         # Dictionary is keyed by first word
-        StaticPhrases.DICT[wlist[0]].append((wlist[1:], ix))
+        self.DICT.setdefault(wlist[0], []).append((wlist[1:], ix))
 
-    @staticmethod
-    def add_errors(words, error):
+    def add_errors(self, words, error):
         # Dictionary structure : { phrase : (error_code, right_phrase, right_tag_string, right_lemma_string) }
-        StaticPhrases.ERROR_DICT[words] = error
+        self.ERROR_DICT[words] = error
 
-    @staticmethod
-    def set_meaning(meaning):
+    def set_meaning(self, meaning):
         """ Set the default meaning for static phrases """
-        StaticPhrases.MEANING = tuple(meaning)
+        self.MEANING = tuple(meaning)
 
-    @staticmethod
-    def get_meaning(ix):
-        """ Return the meaning of the phrase with index ix """
-        return [StaticPhrases.LIST[ix][1]]
+    def get_meaning(self, ix):
+        """ Return the meaning of the phrase with index ix, as a sequence
+            containing one meaning tuple. The sequence is shared
+            and immutable. """
+        return self.MEANINGS[ix]
 
-    @staticmethod
-    def get_length(ix):
+    def get_length(self, ix):
         """ Return the length of the phrase with index ix """
-        return len(StaticPhrases.LIST[ix][0].split())
+        return self.LENGTHS[ix]
 
-    @staticmethod
-    def lookup(phrase):
+    def lookup(self, phrase):
         """ Lookup an entire phrase """
-        return StaticPhrases.MAP.get(phrase)
+        return self.MAP.get(phrase)
 
-    @staticmethod
-    def has_details(phrase):
+    def has_details(self, phrase):
         """ Return True if tag and lemma details are available for this phrase """
-        return phrase in StaticPhrases.DETAILS
+        return phrase in self.DETAILS
 
-    @staticmethod
-    def tags(phrase):
+    def tags(self, phrase):
         """ Lookup a list of IFD tags for a phrase, if available """
-        details = StaticPhrases.DETAILS.get(phrase)
+        details = self.DETAILS.get(phrase)
         return None if details is None else details[0].split()
 
-    @staticmethod
-    def lemmas(phrase):
+    def lemmas(self, phrase):
         """ Lookup a list of lemmas for a phrase, if available """
-        details = StaticPhrases.DETAILS.get(phrase)
+        details = self.DETAILS.get(phrase)
         return None if details is None else details[1].split()
 
+    def freeze(self):
+        """ Convert the parsing dictionary to a plain dict with tuple values,
+            and the phrase lists to tuples, once the config file has been read.
+            Also compile the parsing dictionary into a trie. """
+        self.DICT = {w: tuple(phrases) for w, phrases in self.DICT.items()}
+        self.TRIE = compile_phrase_trie(self.DICT)
+        self.PHRASES = tuple(self.PHRASES)
+        self.MEANINGS = tuple(self.MEANINGS)
+        self.LENGTHS = tuple(self.LENGTHS)
+        self._frozen = True
+
+
+StaticPhrases = _StaticPhrases()
 
-class AmbigPhrases:
+
+class _AmbigPhrases:
 
     """ Wrapper around dictionary of potentially ambiguous phrases,
         initialized from the config file """
 
-    # List of tuples of ambiguous phrases and their word category lists
-    LIST = []
-    # Parsing dictionary keyed by first word of phrase
-    DICT = defaultdict(list)
-    # Error dictionary, { phrase : (error_code, right_phrase, right_parts_of_speech) }
-    ERROR_DICT = defaultdict(list)
-
-    @staticmethod
-    def add(words, cats):
+    __slots__ = ("LIST", "DICT", "TRIE", "ERROR_DICT", "_frozen")
+
+    def __init__(self):
+        # List of tuples of ambiguous phrases and their word category lists
+        self.LIST = []
+        # Parsing dictionary keyed by first word of phrase
+        self.DICT = defaultdict(list)
+        # The parsing dictionary compiled into a trie (see compile_phrase_trie())
+        self.TRIE = {}
+        # Error dictionary, { phrase : (error_code, right_phrase, right_parts_of_speech) }
+        self.ERROR_DICT = defaultdict(list)
+        # Set by freeze(), after which no phrases can be added
+        self._frozen = False
+
+    def add(self, words, cats):
         """ Add an ambiguous phrase to the dictionary.
             Called from the config file handler. """
+        if self._frozen:
+            raise ConfigError(
+                "Ambiguous phrases cannot be added after the config is read"
+            )
 
         # First add to phrase list
-        ix = len(AmbigPhrases.LIST)
+        ix = len(self.LIST)
 
         # Append the phrase as well as its meaning in tuple form
-        AmbigPhrases.LIST.append((words, cats))
+        self.LIST.append((words, cats))
 
         # Dictionary structure: dict { firstword: [ (restword_list, phrase_index) ] }
-        AmbigPhrases.DICT[words[0]].append((words[1:], ix))
+        self.DICT[words[0]].append((words[1:], ix))
 
-    @staticmethod
-    def add_error(words, error):
+    def add_error(self, words, error):
         # Dictionary structure:
         # dict { phrase : (error_code, right_phrase, right_parts_of_speech) }
-        AmbigPhrases.ERROR_DICT[words] = error
+        self.ERROR_DICT[words] = error
 
-    @staticmethod
-    def get_cats(ix):
+    def get_cats(self, ix):
         """ Return the word categories for the phrase with index ix """
-        return AmbigPhrases.LIST[ix][1]
+        return self.LIST[ix][1]
 
+    def freeze(self):
+        """ Convert the parsing dictionary to a plain dict with tuple values,
+            once the config file has been read. Also compile the parsing
+            dictionary into a trie. """
+        self.DICT = {w: tuple(phrases) for w, phrases in self.DICT.items()}
+        self.TRIE = compile_phrase_trie(self.DICT)
+        self._frozen = True
 
-class NoIndexWords:
+
+AmbigPhrases = _AmbigPhrases()
+
+
+class _NoIndexWords:
 
     """ Wrapper around set of word stems and categories that should
         not be indexed """
 
-    SET = set()  # Set of (stem, cat) tuples
-    _CAT = "so"  # Default category
+    __slots__ = ("SET", "_CAT", "CATEGORIES_TO_INDEX")
 
-    # The word categories that are indexed in the words table
-    CATEGORIES_TO_INDEX = frozenset(
-        ("kk", "kvk", "hk", "person_kk", "person_kvk", "entity", "lo", "so")
-    )
+    def __init__(self):
+        self.SET = set()  # Set of (stem, cat) tuples
+        self._CAT = "so"  # Default category
 
-    @staticmethod
-    def set_cat(cat):
+        # The word categories that are indexed in the words table
+        self.CATEGORIES_TO_INDEX = frozenset(
+            ("kk", "kvk", "hk", "person_kk", "person_kvk", "entity", "lo", "so")
+        )
+
+    def set_cat(self, cat):
         """ Set the category for the following word stems """
-        NoIndexWords._CAT = cat
+        self._CAT = cat
 
-    @staticmethod
-    def add(stem):
+    def add(self, stem):
         """ Add a word stem and its category. Called from the config file handler. """
-        NoIndexWords.SET.add((stem, NoIndexWords._CAT))
+        self.SET.add((stem, self._CAT))
+
 
+NoIndexWords = _NoIndexWords()
 
-class Topics:
+
+class _Topics:
 
     """ Wrapper around topics, represented as a dict (name: set) """
 
-    DICT = defaultdict(set)  # Dict of topic name: set
-    ID = dict()  # Dict of identifier: topic name
-    THRESHOLD = dict()  # Dict of identifier: threshold (as a float)
-    _name = None
+    __slots__ = ("DICT", "ID", "THRESHOLD", "_name")
 
-    @staticmethod
-    def set_name(name):
+    def __init__(self):
+        self.DICT = defaultdict(set)  # Dict of topic name: set
+        self.ID = dict()  # Dict of identifier: topic name
+        self.THRESHOLD = dict()  # Dict of identifier: threshold (as a float)
+        self._name = None
+
+    def set_name(self, name):
         """ Set the topic name for the words that follow """
         a = name.split("|")
-        Topics._name = tname = a[0].strip()
+        self._name = tname = a[0].strip()
         identifier = a[1].strip() if len(a) > 1 else None
         if identifier is not None and not identifier.isidentifier():
             raise ConfigError(
@@ -609,13 +895,12 @@ class Topics:
             threshold = float(a[2].strip()) if len(a) > 2 else None
         except ValueError:
             raise ConfigError("Topic threshold must be a floating point number")
-        Topics.ID[tname] = identifier
-        Topics.THRESHOLD[tname] = threshold
+        self.ID[tname] = identifier
+        self.THRESHOLD[tname] = threshold
 
-    @staticmethod
-    def add(word):
+    def add(self, word):
         """ Add a word stem and its category. Called from the config file handler. """
-        if Topics._name is None:
+        if self._name is None:
             raise ConfigError(
                 "Must set topic name (topic = X) before specifying topic words"
             )
@@ -624,119 +909,134 @@ class Topics:
                 "Topic words must include a slash '/' and a word category"
             )
         cat = word.split("/", maxsplit=1)[1]
-        if cat not in {
-            "kk",
-            "kvk",
-            "hk",
-            "lo",
-            "so",
-            "entity",
-            "person",
-            "person_kk",
-            "person_kvk",
-        }:
+        if cat not in _VALID_TOPIC_CATS:
             raise ConfigError(
                 "Topic words must be nouns, verbs, adjectives, entities or persons"
             )
         # Add to topic set, after replacing spaces with underscores
-        Topics.DICT[Topics._name].add(word.replace(" ", "_"))
+        self.DICT[self._name].add(word.replace(" ", "_"))
+
 
+Topics = _Topics()
 
-class AdjectivePredicates:
+
+class _AdjectivePredicates:
 
     """ A set of arguments and prepositions associated with
         adjectives, for instance 'tengdur þgf', typically read from
         the [adjective_predicates] section of AdjectivePredicates.conf """
 
-    # dict { adjective lemma : set of possible argument cases }
-    ARGUMENTS = defaultdict(set)
-    # dict { adjective lemma : set of (preposition, case) }
-    PREPOSITIONS = defaultdict(set)
+    __slots__ = ("ARGUMENTS", "PREPOSITIONS", "ERROR_DICT", "ERROR_PREPOSITIONS")
 
-    # dict { adjective lemma : [ (argument case, error code) ] }
-    ERROR_DICT = defaultdict(list)
+    def __init__(self):
+        # dict { adjective lemma : set of possible argument cases }
+        self.ARGUMENTS = defaultdict(set)
+        # dict { adjective lemma : set of (preposition, case) }
+        self.PREPOSITIONS = defaultdict(set)
 
-    # dict { adjective lemma : set of (preposition, case) }
-    ERROR_PREPOSITIONS = defaultdict(set)
+        # dict { adjective lemma : [ (argument case, error code) ] }
+        self.ERROR_DICT = defaultdict(list)
 
-    @staticmethod
-    def add(adj, arg, prepositions):
+        # dict { adjective lemma : set of (preposition, case) }
+        self.ERROR_PREPOSITIONS = defaultdict(set)
+
+    def add(self, adj, arg, prepositions):
         if arg:
             # Add a case that is associated with an adjective
-            AdjectivePredicates.ARGUMENTS[adj].update(arg)
+            self.ARGUMENTS[adj].update(arg)
         if prepositions:
             # Add a (preposition, case) tuple that is associated with an adjective
-            AdjectivePredicates.PREPOSITIONS[adj].update(prepositions)
+            self.PREPOSITIONS[adj].update(prepositions)
 
-    @staticmethod
-    def add_error(adj, arg, prepositions, error):
+    def add_error(self, adj, arg, prepositions, error):
         if arg and error:
             for a in arg:
-                AdjectivePredicates.ERROR_DICT[adj].append((a, error))
+                self.ERROR_DICT[adj].append((a, error))
         if prepositions:
-            AdjectivePredicates.ERROR_PREPOSITIONS[adj].update(prepositions)
+            self.ERROR_PREPOSITIONS[adj].update(prepositions)
+
 
+AdjectivePredicates = _AdjectivePredicates()
 
 
-class Preferences:
+class _Preferences:
 
     """ Wrapper around disambiguation hints, initialized from the config file """
 
-    # Dictionary keyed by word containing a list of tuples (worse, better)
-    # where each is a list of terminal prefixes
-    DICT = defaultdict(list)
+    __slots__ = ("DICT",)
 
-    @staticmethod
-    def add(word, worse, better, factor):
+    def __init__(self):
+        # Dictionary keyed by word containing a list of tuples (worse, better)
+        # where each is a list of terminal prefixes
+        self.DICT = defaultdict(list)
+
+    def add(self, word, worse, better, factor):
         """ Add a preference to the dictionary. Called from the config file handler. """
-        Preferences.DICT[word].append((worse, better, factor))
+        self.DICT[word].append((worse, better, factor))
 
-    @staticmethod
-    def get(word):
+    def get(self, word):
         """ Return a list of (worse, better, factor) tuples for the given word """
-        return Preferences.DICT.get(word, None)
+        return self.DICT.get(word, None)
+
+
+Preferences = _Preferences()
 
 
-class StemPreferences:
+class _StemPreferences:
 
     """ Wrapper around stem disambiguation hints, initialized from the config file """
 
-    # Dictionary keyed by word form containing a list of tuples (worse, better)
-    # where each is a list word stems
-    DICT = dict()
+    __slots__ = ("DICT",)
 
-    @staticmethod
-    def add(word, worse, better):
+    def __init__(self):
+        # Dictionary keyed by word form containing a list of tuples (worse, better)
+        # where each is a list word stems
+        self.DICT = dict()
+
+    def add(self, word, worse, better):
         """ Add a preference to the dictionary. Called from the config file handler. """
-        if word in StemPreferences.DICT:
+        if word in self.DICT:
             raise ConfigError(
                 "Duplicate stem preference for word form {0}".format(word)
             )
-        StemPreferences.DICT[word] = (worse, better)
+        self.DICT[word] = (worse, better)
 
-    @staticmethod
-    def get(word):
+    def get(self, word):
         """ Return a list of (worse, better) tuples for the given word form """
-        return StemPreferences.DICT.get(word, None)
+        return self.DICT.get(word, None)
+
+
+StemPreferences = _StemPreferences()
 
 
-class NounPreferences:
+class _NounPreferences:
 
     """ Wrapper for noun preferences, i.e. to assign priorities to different
         noun stems that can have identical word forms. """
 
-    # This is a dict of noun word forms, giving the relative priorities
-    # of different genders
-    DICT = defaultdict(dict)
+    __slots__ = ("DICT",)
 
-    @staticmethod
-    def add(word, worse, better):
+    # Index of each gender within the priority sequences in DICT
+    GENDER_INDEX = {"kk": 0, "kvk": 1, "hk": 2}
+
+    def __init__(self):
+        # This is a dict of noun word forms, giving the relative priorities
+        # of different genders as a sequence indexed by GENDER_INDEX,
+        # i.e. [kk, kvk, hk]. Unassigned priorities are None while
+        # the config file is being read, and 0 once it has been frozen.
+        self.DICT = dict()
+
+    def add(self, word, worse, better):
         """ Add a preference to the dictionary. Called from the config file handler. """
         if worse not in _ALL_GENDERS or better not in _ALL_GENDERS:
             raise ConfigError("Noun priorities must specify genders (kk, kvk, hk)")
-        d = NounPreferences.DICT[word]
-        worse_score = d.get(worse)
-        better_score = d.get(better)
+        d = self.DICT.get(word)
+        if d is None:
+            d = self.DICT[word] = [None, None, None]
+        worse = self.GENDER_INDEX[worse]
+        better = self.GENDER_INDEX[better]
+        worse_score = d[worse]
+        better_score = d[better]
         if worse_score is not None:
             if better_score is not None:
                 raise ConfigError("Conflicting priorities for noun {0}".format(word))
@@ -750,43 +1050,68 @@ class NounPreferences:
         d[better] = better_score
         # print("Noun prefs for '{0}' are now {1}".format(word, d))
 
+    def freeze(self):
+        """ Convert the priority lists to tuples of integers,
+            once the config file has been read """
+        self.DICT = {
+            word: tuple(sc or 0 for sc in prefs) for word, prefs in self.DICT.items()
+        }
+
+
+NounPreferences = _NounPreferences()
 
-class NamePreferences:
+
+class _NamePreferences:
 
     """ Wrapper around well-known person names, initialized from the config file """
 
-    SET = set()
+    __slots__ = ("SET",)
 
-    @staticmethod
-    def add(name):
+    def __init__(self):
+        self.SET = set()
+
+    def add(self, name):
         """ Add a preference to the dictionary. Called from the config file handler. """
-        NamePreferences.SET.add(name)
+        self.SET.add(name)
+
+
+NamePreferences = _NamePreferences()
 
 
-class BinErrata:
+class _BinErrata:
 
     """ Wrapper around BÍN errata, initialized from the config file """
 
-    DICT = dict()
+    __slots__ = ("DICT",)
 
-    @staticmethod
-    def add(stem, ordfl, fl):
+    def __init__(self):
+        self.DICT = dict()
+
+    def add(self, stem, ordfl, fl):
         """ Add a BÍN fix. Used by bincompress.py when generating a new
             compressed vocabulary file. """
-        BinErrata.DICT[(stem, ordfl)] = fl
+        self.DICT[(stem, ordfl)] = fl
+
 
+BinErrata = _BinErrata()
 
-class BinDeletions:
+
+class _BinDeletions:
 
     """ Wrapper around BÍN deletions, initialized from the config file """
 
-    SET = set()
+    __slots__ = ("SET",)
 
-    @staticmethod
-    def add(stem, ordfl, fl):
+    def __init__(self):
+        self.SET = set()
+
+    def add(self, stem, ordfl, fl):
         """ Add a BÍN fix. Used by bincompress.py when generating a new
             compressed vocabulary file. """
-        BinDeletions.SET.add((stem, ordfl, fl))
+        self.SET.add((stem, ordfl, fl))
+
+
+BinDeletions = _BinDeletions()
 
 
 # Global settings
@@ -848,61 +1173,44 @@ class Settings:
     @staticmethod
     def _handle_settings(s):
         """ Handle config parameters in the settings section """
-        a = s.lower().split("=", maxsplit=1)
-        par = a[0].strip().lower()
-        val = a[1].strip()
-        if val.lower() == "none":
+        par, sep, val = s.lower().partition("=")
+        if not sep:
+            raise ConfigError("Expected 'parameter = value' in settings")
+        par = par.strip()
+        val = val.strip()
+        if val == "none":
             val = None
-        elif val.lower() == "true":
+        elif val == "true":
             val = True
-        elif val.lower() == "false":
+        elif val == "false":
             val = False
-        try:
-            if par == "db_hostname":
-                Settings.DB_HOSTNAME = Settings.BIN_DB_HOSTNAME = val
-            elif par == "db_port":
-                Settings.DB_PORT = Settings.BIN_DB_PORT = int(val)
-            elif par == "bin_db_hostname":
-                # Specify this after db_hostname if different from db_hostname
-                Settings.BIN_DB_HOSTNAME = val
-            elif par == "bin_db_port":
-                # Specify this after db_port if different from db_port
-                Settings.BIN_DB_PORT = int(val)
-            elif par == "host":
-                Settings.HOST = val
-            elif par == "port":
-                Settings.PORT = int(val)
-            elif par == "simserver_host":
-                Settings.SIMSERVER_HOST = val
-            elif par == "simserver_port":
-                Settings.SIMSERVER_PORT = int(val)
-            elif par == "debug":
-                Settings.DEBUG = bool(val)
-            else:
-                raise ConfigError("Unknown configuration parameter '{0}'".format(par))
-        except ValueError:
-            raise ConfigError("Invalid parameter value: {0} = {1}".format(par, val))
+        param = Settings._SETTINGS_PARAMS.get(par)
+        if param is None:
+            raise ConfigError("Unknown configuration parameter '{0}'".format(par))
+        attrs, convert = param
+        if convert is not None:
+            try:
+                val = convert(val)
+            except ValueError:
+                raise ConfigError("Invalid parameter value: {0} = {1}".format(par, val))
+        for attr in attrs:
+            setattr(Settings, attr, val)
 
     @staticmethod
     def _handle_static_phrases(s):
         """ Handle static phrases in the settings section """
-        error = False
         if "=" not in s:
-            ix = s.rfind("$error(")  # Must be at the end
-            if ix >= 0:
-                error = True
-                # A typical format is
-                # $error(error_code, right_phrase, right_parts_of_speech)
-                e = s[ix + 7 :].lstrip().rstrip(" )").split(", ")
-                s = s[:ix].strip()
+            # A typical format is
+            # $error(error_code, right_phrase, right_parts_of_speech)
+            s, error = _peel_pragma(s, "error")
             StaticPhrases.add(s)
-            if error:
-                StaticPhrases.add_errors(s.split(",")[0], e)
+            if error is not None:
+                StaticPhrases.add_errors(s.split(",")[0], error.split(", "))
             return
         # Check for a meaning spec
-        a = s.split("=", maxsplit=1)
-        par = a[0].strip()
-        val = a[1].strip()
+        par, _, val = s.partition("=")
+        par = par.strip()
+        val = val.strip()
         if par.lower() == "meaning":
             m = val.split()
             if len(m) == 3:
@@ -934,31 +1242,25 @@ class Settings:
         # Format: verb [arg1] [arg2] [/preposition arg]... [$score(sc)]
         # arg can be nf, þf, þgf, ef, nh, falls, sig/sér/sín, bági_kk_ft_þf
         error = None
-
-        # Start by handling the $score() pragma, if present
         score = 0
-        ix = s.rfind("$score(")  # Must be at the end
-        if ix >= 0:
-            sc = s[ix:]
-            s = s[0:ix].strip()
-            if not sc.endswith(")"):
-                raise ConfigError("Invalid score pragma; form should be $score(n)")
-            # There is an associated score with this verb form, to be taken
-            # into consideration by the reducer
-            sc = sc[7:-1].strip()
-            try:
-                score = int(sc)
-            except ValueError:
-                raise ConfigError("Invalid score ('{0}') for verb form".format(sc))
 
-        # Check for $error
-        ix = s.rfind("$error(")
-        if ix >= 0:
-            if not s.endswith(")"):
-                raise ConfigError("Invalid error pragma; form should be $error(...)")
-            error = s[ix + 7 : -1].strip()
-            s = s[0:ix].strip()
-            if not error:
+        # Pragmas start with a '$', and most lines have none:
+        # in that case, a single scan of the line suffices
+        if "$" in s:
+
+            # Start by handling the $score() pragma, if present
+            s, sc = _peel_pragma(s, "score")
+            if sc is not None:
+                # There is an associated score with this verb form, to be taken
+                # into consideration by the reducer
+                try:
+                    score = int(sc)
+                except ValueError:
+                    raise ConfigError("Invalid score ('{0}') for verb form".format(sc))
+
+            # Check for $error
+            s, error = _peel_pragma(s, "error")
+            if error == "":
                 raise ConfigError("Expected error specification in $error(...)")
 
         # Process particles, should only be one in each line
@@ -974,26 +1276,23 @@ class Settings:
 
         # Process preposition arguments, if any
         prepositions = []
-        ap = s.split("/")
-        s = ap[0]
-        ix = 1
-        while len(ap) > ix:
+        s, sep, rest = s.partition("/")
+        # Most lines have no prepositions, and skip the loop entirely
+        for p in rest.split("/") if sep else ():
             # We expect something like 'af þgf', or possibly
             # 'fyrir_hönd þf' (where the underscore needs to be replaced by a space)
-            p = ap[ix].strip()
             parg = p.split()
             if len(parg) != 2:
                 raise ConfigError("Preposition should have exactly one argument")
-            if parg[1] not in _ALL_CASES and parg[1] not in _SUBCLAUSES:
-                if parg[1] in _REFLPRN:
-                    parg[1] = _REFLPRN[parg[1]]
-                spl = parg[1].split("_")
+            arg = _PREP_ARGS.get(parg[1])
+            if arg is None:
+                arg = parg[1]
+                spl = arg.split("_")
                 if spl[-1] == "gr":
                     spl = spl[:-1]
                 if spl[-1] not in _ALL_CASES:
                     raise ConfigError("Unknown argument for preposition")
-            prepositions.append((parg[0].replace("_", " "), parg[1]))
-            ix += 1
+            prepositions.append((parg[0].replace("_", " "), arg))
 
         # Process verb arguments
         a = s.split()
@@ -1015,26 +1314,18 @@ class Settings:
     def _handle_verb_subjects(s):
         """ Handle verb subject specifications in the settings section """
         # Format: subject = [case] followed by verb list
-        a = s.lower().split("=", maxsplit=1)
-        if len(a) == 2:
-            par = a[0].strip()
-            val = a[1].strip()
+        # (only parameter lines are lowercased; $error pragmas are case-sensitive)
+        par, sep, val = s.partition("=")
+        if sep:
+            par = par.strip().lower()
+            val = val.strip().lower()
             if par == "subject":
                 VerbSubjects.set_case(val)
             else:
                 raise ConfigError("Unknown setting '{0}' in verb_subjects".format(par))
             return
-        assert len(a) == 1
-        par = s.strip()
         # Check for $error
-        e = None
-        ix = par.rfind("$error(")
-        if ix >= 0:
-            if par[-1] != ")":
-                raise ConfigError("Missing right parenthesis in $error()")
-            e = par[ix + 7 : -1].strip()
-            par = par[0:ix].strip()
-
+        par, e = _peel_pragma(s, "error")
         if e is not None:
             VerbSubjects.add_error(par, e)
         else:
@@ -1043,7 +1334,7 @@ class Settings:
     @staticmethod
     def _handle_undeclinable_adjectives(s):
         """ Handle list of undeclinable adjectives """
-        s = s.lower().strip()
+        s = s.lower()
         if not s.isalpha():
             raise ConfigError(
                 "Expected word but got '{0}' in undeclinable_adjectives".format(s)
@@ -1054,45 +1345,41 @@ class Settings:
     def _handle_noindex_words(s):
         """ Handle no index instructions in the settings section """
         # Format: category = [cat] followed by word stem list
-        a = s.lower().split("=", maxsplit=1)
-        par = a[0].strip()
-        if len(a) == 2:
-            val = a[1].strip()
+        par, sep, val = s.lower().partition("=")
+        par = par.strip()
+        if sep:
+            val = val.strip()
             if par == "category":
                 NoIndexWords.set_cat(val)
             else:
                 raise ConfigError("Unknown setting '{0}' in noindex_words".format(par))
             return
-        assert len(a) == 1
         NoIndexWords.add(par)
 
     @staticmethod
     def _handle_topics(s):
         """ Handle topic specifications """
         # Format: name = [topic name] followed by word stem list in the form word/cat
-        a = s.split("=", maxsplit=1)
-        par = a[0].strip()
-        if len(a) == 2:
-            val = a[1].strip()
+        par, sep, val = s.partition("=")
+        par = par.strip()
+        if sep:
+            val = val.strip()
             if par.lower() == "topic":
                 Topics.set_name(val)
             else:
                 raise ConfigError("Unknown setting '{0}' in topics".format(par))
             return
-        assert len(a) == 1
         Topics.add(par)
 
     @staticmethod
     def _handle_prepositions(s):
         """ Handle preposition specifications in the settings section """
         # Format: pw1 pw2... case [nh]  [$error(X)]
-        error = False
         corr = None
-        ix = s.rfind("$error(")  # Must be at the end
-        if ix >= 0:
+        s, error = _peel_pragma(s, "error")
+        if error is not None:
             # A typical format is $error(FORM-inn_á)
-            error = True
-            e = s[ix + 7 :].lstrip().rstrip(" )").split("-")
+            e = error.split("-")
             if len(e) == 2:
                 # Probably $error(FORM-xxx_xxx)
                 corr = (e[0], " ".join(e[1].split("_")))
@@ -1104,7 +1391,6 @@ class Settings:
                     "$error() pragma should have the form XXX[-yyy] "
                     "where XXX is a category and yyy is a phrase"
                 )
-            s = s[:ix].strip()
         a = s.split()
         if len(a) < 2:
             raise ConfigError("Preposition must specify a word and a case argument")
@@ -1123,7 +1409,7 @@ class Settings:
             raise ConfigError("Preposition must have a case argument (nf/þf/þgf/ef)")
         pp = " ".join(a[:-1])  # Preposition, possibly multi-word
         Prepositions.add(pp, c, nh)
-        if error:
+        if error is not None:
             Prepositions.add_error(pp, c, corr)
 
     @staticmethod
@@ -1132,23 +1418,23 @@ class Settings:
         # Format: word worse1 worse2... < better
         # If two less-than signs are used, the preference is even stronger (tripled)
         # If three less-than signs are used, the preference is super strong (nine-fold)
-        factor = 9
-        a = s.lower().split("<<<", maxsplit=1)
-        if len(a) != 2:
-            factor = 3
-            a = s.lower().split("<<", maxsplit=1)
-            if len(a) != 2:
-                # Not doubled preference: try a normal one
-                a = s.lower().split("<", maxsplit=1)
-                factor = 1
-        if len(a) != 2:
+        s = s.lower()
+        ix = s.find("<")
+        if ix < 0:
             raise ConfigError("Ambiguity preference missing less-than sign '<'")
-        w = a[0].split()
+        # The number of adjacent less-than signs determines the factor
+        if s.startswith("<<<", ix):
+            factor, ix_better = 9, ix + 3
+        elif s.startswith("<<", ix):
+            factor, ix_better = 3, ix + 2
+        else:
+            factor, ix_better = 1, ix + 1
+        w = s[:ix].split()
         if len(w) < 2:
             raise ConfigError(
                 "Ambiguity preference must have at least one 'worse' category"
             )
-        b = a[1].split()
+        b = s[ix_better:].split()
         if len(b) < 1:
             raise ConfigError(
                 "Ambiguity preference must have at least one 'better' category"
@@ -1159,15 +1445,15 @@ class Settings:
     def _handle_stem_preferences(s):
         """ Handle stem ambiguity preference hints in the settings section """
         # Format: word worse1 worse2... < better
-        a = s.lower().split("<", maxsplit=1)
-        if len(a) != 2:
+        worse, sep, better = s.lower().partition("<")
+        if not sep:
             raise ConfigError("Ambiguity preference missing less-than sign '<'")
-        w = a[0].split()
+        w = worse.split()
         if len(w) < 2:
             raise ConfigError(
                 "Ambiguity preference must have at least one 'worse' category"
             )
-        b = a[1].split()
+        b = better.split()
         if len(b) < 1:
             raise ConfigError(
                 "Ambiguity preference must have at least one 'better' category"
@@ -1179,13 +1465,13 @@ class Settings:
         """ Handle noun preference hints in the settings section """
         # Format: noun worse1 worse2... < better
         # The worse and better specifiers are gender names (kk, kvk, hk)
-        a = s.lower().split("<", maxsplit=1)
-        if len(a) != 2:
+        worse, sep, better = s.lower().partition("<")
+        if not sep:
             raise ConfigError("Noun preference missing less-than sign '<'")
-        w = a[0].split()
+        w = worse.split()
         if len(w) != 2:
             raise ConfigError("Noun preference must have exactly one 'worse' gender")
-        b = a[1].split()
+        b = better.split()
         if len(b) != 1:
             raise ConfigError("Noun preference must have exactly one 'better' gender")
         NounPreferences.add(w[0], w[1], b[0])
@@ -1198,10 +1484,10 @@ class Settings:
     @staticmethod
     def _handle_bin_errata(s):
         """ Handle changes to BÍN categories ('fl') """
-        a = s.split()
-        if len(a) != 3:
+        try:
+            stem, ordfl, fl = s.split()
+        except ValueError:
             raise ConfigError("Expected 'stem ordfl fl' fields in bin_errata section")
-        stem, ordfl, fl = a
         if not ordfl.islower() or not fl.islower():
             raise ConfigError(
                 "Expected lowercase ordfl and fl fields in bin_errata section"
@@ -1211,12 +1497,12 @@ class Settings:
     @staticmethod
     def _handle_bin_deletions(s):
         """ Handle deletions from BÍN, given as stem/ordfl/fl triples """
-        a = s.split()
-        if len(a) != 3:
+        try:
+            stem, ordfl, fl = s.split()
+        except ValueError:
             raise ConfigError(
                 "Expected 'stem ordfl fl' fields in bin_deletions section"
             )
-        stem, ordfl, fl = a
         if not ordfl.islower() or not fl.islower():
             raise ConfigError(
                 "Expected lowercase ordfl and fl fields in bin_deletions section"
@@ -1227,27 +1513,26 @@ class Settings:
     def _handle_ambiguous_phrases(s):
         """ Handle ambiguous phrase guidance in the settings section """
         # Format: "word1 word2..." cat1 cat2...
-        error = False
         if s[0] != '"':
             raise ConfigError("Ambiguous phrase must be enclosed in double quotes")
-        ix = s.rfind("$error(")  # Must be at the end
-        if ix >= 0:
-            error = True
-            # A typical format is
-            # $error(error_code, right_phrase, right_parts_of_speech)
-            e = s[ix + 7 :].lstrip().rstrip(" )").split(", ")
-            s = s[:ix].strip()
-        q = s.rfind('"')
-        if q <= 0:
+        # A typical format is
+        # $error(error_code, right_phrase, right_parts_of_speech)
+        s, error = _peel_pragma(s, "error")
+        # The pragma is case-sensitive, but the phrase and the categories
+        # are not: lowercase them together, in one go
+        s = s.lower()
+        q = s.find('"', 1)
+        if q < 0:
             raise ConfigError("Ambiguous phrase must be enclosed in double quotes")
         # Obtain a list of the words in the phrase
-        words = s[1:q].strip().lower().split()
+        phrase = s[1:q].strip()
+        words = phrase.split()
         if any("*" in word and not word.endswith("*") for word in words):
             raise ConfigError("An asterisk is only allowed at the end of lemmas")
         if len(words) < 2:
             raise ConfigError("Ambiguous phrase must contain at least two words")
         # Obtain a list of the corresponding word categories
-        cats = s[q + 1 :].strip().lower().split()
+        cats = s[q + 1 :].split()
         if len(words) != len(cats):
             raise ConfigError(
                 "Ambiguous phrase has {0} words but {1} category sets".format(
@@ -1256,7 +1541,7 @@ class Settings:
             )
         # Convert the list of category specifiers to a tuple of frozensets of
         # word categories
-        cats_t = tuple(frozenset(cat.split("/")) for cat in cats)
+        cats_t = tuple(frozenset(map(intern, cat.split("/"))) for cat in cats)
         # Check for something like ao/ or so//fs
         if any("" in cats_set for cats_set in cats_t):
             raise ConfigError("Empty category set not allowed")
@@ -1264,19 +1549,20 @@ class Settings:
         if any("*" in cats_set and len(cats_set) > 1 for cats_set in cats_t):
             raise ConfigError("Redundant category specified alongside wildcard '*'")
         AmbigPhrases.add(words, cats_t)
-        if error:
-            AmbigPhrases.add_error(s[1:q].strip().lower(), e)
+        if error is not None:
+            AmbigPhrases.add_error(phrase, error.split(", "))
 
     @staticmethod
     def _handle_adjective_template(s):
         """ Handle the template for new adjectives in the settings section """
         # Format: adjective-ending bin-meaning
-        a = s.split()
-        if len(a) != 2:
+        try:
+            ending, form = s.split()
+        except ValueError:
             raise ConfigError(
                 "Adjective template should have an ending and a form specifier"
             )
-        AdjectiveTemplate.add(a[0], a[1])
+        AdjectiveTemplate.add(ending, form)
 
     @staticmethod
     def _handle_disallowed_names(s):
@@ -1292,36 +1578,69 @@ class Settings:
     @staticmethod
     def _handle_adjective_predicates(s):
         # Process preposition arguments, if any
-        error = False
-        ix = s.rfind("$error(")  # Must be at the end
-        if ix >= 0:
-            error = True
-            # A typical format is
-            # $error(error_code, right_phrase, right_parts_of_speech)
-            e = s[ix + 7 :].lstrip().rstrip(" )").split(",")
-            s = s[:ix].strip()
+        # A typical format is
+        # $error(error_code, right_phrase, right_parts_of_speech)
+        s, error = _peel_pragma(s, "error")
 
         prepositions = []
-        ap = s.split("/")
-        s = ap[0]
-        ix = 1
-        while len(ap) > ix:
+        s, sep, rest = s.partition("/")
+        for p in rest.split("/") if sep else ():
             # We expect something like 'af þgf'
-            p = ap[ix].strip()
             parg = p.split()
             if len(parg) != 2:
                 raise ConfigError("Preposition should have exactly one argument")
             if parg[1] not in _ALL_CASES:
                 raise ConfigError("Unknown argument case for preposition")
             prepositions.append((parg[0], parg[1]))
-            ix += 1
         a = s.split()
         adj = a[0]
-        if error:
-            AdjectivePredicates.add_error(adj, a[1:], prepositions, e)
+        if error is not None:
+            AdjectivePredicates.add_error(adj, a[1:], prepositions, error.split(","))
         else:
             AdjectivePredicates.add(adj, a[1:], prepositions)
 
+    # Parameters of the [settings] section, mapped to the Settings
+    # attributes that they set and a conversion function for the value
+    _SETTINGS_PARAMS = {
+        "db_hostname": (("DB_HOSTNAME", "BIN_DB_HOSTNAME"), None),
+        "db_port": (("DB_PORT", "BIN_DB_PORT"), int),
+        # Specify this after db_hostname if different from db_hostname
+        "bin_db_hostname": (("BIN_DB_HOSTNAME",), None),
+        # Specify this after db_port if different from db_port
+        "bin_db_port": (("BIN_DB_PORT",), int),
+        "host": (("HOST",), None),
+        "port": (("PORT",), int),
+        "simserver_host": (("SIMSERVER_HOST",), None),
+        "simserver_port": (("SIMSERVER_PORT",), int),
+        "debug": (("DEBUG",), bool),
+    }
+
+    # Section handlers, keyed by section name. The plain functions
+    # are stored, rather than the staticmethod objects, so that they
+    # can be called directly.
+    _CONFIG_HANDLERS = {
+        "settings": _handle_settings.__func__,
+        "static_phrases": _handle_static_phrases.__func__,
+        "abbreviations": _handle_abbreviations.__func__,
+        "verb_objects": _handle_verb_objects.__func__,
+        "verb_subjects": _handle_verb_subjects.__func__,
+        "prepositions": _handle_prepositions.__func__,
+        "preferences": _handle_preferences.__func__,
+        "noun_preferences": _handle_noun_preferences.__func__,
+        "name_preferences": _handle_name_preferences.__func__,
+        "stem_preferences": _handle_stem_preferences.__func__,
+        "ambiguous_phrases": _handle_ambiguous_phrases.__func__,
+        "meanings": _handle_meanings.__func__,
+        "adjective_template": _handle_adjective_template.__func__,
+        "undeclinable_adjectives": _handle_undeclinable_adjectives.__func__,
+        "disallowed_names": _handle_disallowed_names.__func__,
+        "noindex_words": _handle_noindex_words.__func__,
+        "topics": _handle_topics.__func__,
+        "adjective_predicates": _handle_adjective_predicates.__func__,
+        "bin_errata": _handle_bin_errata.__func__,
+        "bin_deletions": _handle_bin_deletions.__func__,
+    }
+
     @staticmethod
     def read(fname):
         """ Read configuration file """
@@ -1331,59 +1650,27 @@ class Settings:
             if Settings.loaded:
                 return
 
-            CONFIG_HANDLERS = {
-                "settings": Settings._handle_settings,
-                "static_phrases": Settings._handle_static_phrases,
-                "abbreviations": Settings._handle_abbreviations,
-                "verb_objects": Settings._handle_verb_objects,
-                "verb_subjects": Settings._handle_verb_subjects,
-                "prepositions": Settings._handle_prepositions,
-                "preferences": Settings._handle_preferences,
-                "noun_preferences": Settings._handle_noun_preferences,
-                "name_preferences": Settings._handle_name_preferences,
-                "stem_preferences": Settings._handle_stem_preferences,
-                "ambiguous_phrases": Settings._handle_ambiguous_phrases,
-                "meanings": Settings._handle_meanings,
-                "adjective_template": Settings._handle_adjective_template,
-                "undeclinable_adjectives": Settings._handle_undeclinable_adjectives,
-                "disallowed_names": Settings._handle_disallowed_names,
-                "noindex_words": Settings._handle_noindex_words,
-                "topics": Settings._handle_topics,
-                "adjective_predicates": Settings._handle_adjective_predicates,
-                "bin_errata": Settings._handle_bin_errata,
-                "bin_deletions": Settings._handle_bin_deletions,
-            }
             handler = None  # Current section handler
+            # Local names for what the per-line loop uses
+            get_handler = Settings._CONFIG_HANDLERS.get
 
             rdr = None
             try:
                 rdr = LineReader(fname)
+                # The reader skips blank lines and comments
                 for s in rdr.lines():
-                    # Ignore comments
-                    ix = s.find("#")
-                    if ix >= 0:
-                        s = s[0:ix]
-                    s = s.strip()
-                    if not s:
-                        # Blank line: ignore
-                        continue
                     if s[0] == "[" and s[-1] == "]":
                         # New section
                         section = s[1:-1].strip().lower()
-                        if section in CONFIG_HANDLERS:
-                            handler = CONFIG_HANDLERS[section]
+                        handler = get_handler(section)
+                        if handler is not None:
                             continue
                         raise ConfigError("Unknown section name '{0}'".format(section))
                     if handler is None:
                         raise ConfigError("No handler for config line '{0}'".format(s))
-                    # Call the correct handler depending on the section
-                    try:
-                        handler(s)
-                    except ConfigError as e:
-                        # Add file name and line number information to the exception
-                        # if it's not already there
-                        e.set_pos(rdr.fname(), rdr.line())
-                        raise e
+                    # Call the correct handler depending on the section.
+                    # A ConfigError gets its position from the handler below.
+                    handler(s)
 
             except ConfigError as e:
                 # Add file name and line number information to the exception
@@ -1392,4 +1679,13 @@ class Settings:
                     e.set_pos(rdr.fname(), rdr.line())
                 raise e
 
+            # The lookup tables don't change after this point:
+            # freeze them for faster and safer lookup
+            VerbObjects.freeze()
+            VerbSubjects.freeze()
+            Prepositions.freeze()
+            StaticPhrases.freeze()
+            AmbigPhrases.freeze()
+            NounPreferences.freeze()
+
             Settings.loaded = True
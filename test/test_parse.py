@@ -398,7 +398,6 @@ def test_consistency(r, verbose=False):
 
         cnt = defaultdict(int)
         scores = defaultdict(int)
-        ptime = 0.0
 
         ITERATIONS = 60
         if verbose:
@@ -408,20 +407,17 @@ def test_consistency(r, verbose=False):
                 )
             )
 
-        for i in range(ITERATIONS):
-            # The following two sentences have different scores
-            if i % 5 == 4:
-                # One fifth of the test cases
-                j = r.submit(tc15)
-            else:
-                # Four fifths of the test cases
-                j = r.submit(tc45)
-            s = next(iter(j))
+        # The following two sentences have different scores.
+        # One fifth of the test cases are tc15, four fifths are tc45.
+        # Submit them all as one job, one sentence per paragraph.
+        inputs = [tc15 if i % 5 == 4 else tc45 for i in range(ITERATIONS)]
+        j = r.submit("\n".join(inputs), split_paragraphs=True)
+        for s in j:
             s.parse()
-            ptime += j.parse_time
             pp = [t.text for t in s.tree.descendants if t.match("PP")]
             cnt[len(pp)] += 1
             scores[s.score] += 1
+        ptime = j.parse_time
 
         if verbose:
             print(
@@ -451,6 +447,21 @@ def test_consistency(r, verbose=False):
         assert ITERATIONS * 4 // 5 in sc_set
 
 
+def test_score_cache(r):
+    """ Check that reparsing a sentence with the terminal score
+        cache warm yields the same score and tree as the first parse """
+    sent = "Barnið fór í augnrannsóknina eftir húsnæðiskaupin."
+    s1 = r.parse_single(sent)
+    cache = r.reducer._score_cache
+    hits = cache.hits
+    for _ in range(3):
+        s2 = r.parse_single(sent)
+        assert s2.score == s1.score
+        assert s2.tree.flat == s1.tree.flat
+        assert s2.terminals == s1.terminals
+    assert cache.hits > hits
+
+
 def test_long_parse(r, verbose=False):
     if verbose:
         print("Long parse test")
@@ -490,6 +501,35 @@ def test_long_parse(r, verbose=False):
         print("Parsing time        : {0:.2f}".format(job.parse_time))
 
 
+def test_parallel_parse(r):
+    txt = (
+        "Barnið fór í augnrannsóknina eftir húsnæðiskaupin. "
+        "Ég sendi póstinn frá Ísafirði með kettinum. "
+        "Þetta er prófun."
+    )
+    serial = [(s.score, s.tree and s.tree.flat) for s in r.submit(txt, parse=True)]
+    job = r.submit(txt, parse=True, parallel=True, max_workers=3)
+    parallel = [(s.score, s.tree and s.tree.flat) for s in job]
+    assert parallel == serial
+    assert job.num_sentences == 3
+
+
+def test_parse_batch(r):
+    texts = [
+        "Barnið fór í augnrannsóknina eftir húsnæðiskaupin. Þetta er prófun.",
+        "Ég sendi póstinn frá Ísafirði með kettinum.",
+    ]
+    results = list(r.parse_batch(texts, max_workers=2))
+    assert len(results) == 2
+    for text, result in zip(texts, results):
+        expected = r.parse(text)
+        assert result["num_sentences"] == expected["num_sentences"]
+        assert result["num_parsed"] == expected["num_parsed"]
+        assert [s.score for s in result["sentences"]] == [
+            s.score for s in expected["sentences"]
+        ]
+
+
 def test_properties(r):
     s = r.parse("Þetta er prófun.")["sentences"][0]
     _ = s.score
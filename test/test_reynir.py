@@ -23,10 +23,18 @@
 """
 
 import functools
+import locale
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 
 from reynir import Reynir
 from reynir.binparser import augment_terminal
 from reynir.bincompress import BIN_Compressed
+from reynir.bintokenizer import MatchingStream
+from reynir.settings import StaticPhrases, AmbigPhrases, ConfigError
+from reynir.settings import compile_phrase_trie, sort_strings
 
 
 def test_augment_terminal():
@@ -48,6 +56,95 @@ def test_augment_terminal():
     assert a == "so_0_et_kk_lhþt_nf_sb"
 
 
+def test_phrases_frozen():
+    """ Phrases cannot be added once the config has been read """
+    # Importing reynir reads the config
+    n = len(StaticPhrases.PHRASES)
+    with pytest.raises(ConfigError):
+        StaticPhrases.add('"alveg nýr frasi"')
+    with pytest.raises(ConfigError):
+        AmbigPhrases.add(["alveg", "nýr"], (frozenset(["ao"]), frozenset(["lo"])))
+    assert len(StaticPhrases.PHRASES) == n
+    assert StaticPhrases.lookup("alveg nýr frasi") is None
+
+
+def test_matching_stream():
+    """ Test phrase matching from a phrase dictionary and from its trie """
+    Tok = namedtuple("Tok", "txt")
+
+    class PhraseStream(MatchingStream):
+
+        def length(self, ix):
+            return (2, 2, 3, 2, 2, 3)[ix]
+
+        def match(self, tq, ix):
+            yield Tok("{0}:{1}".format(" ".join(t.txt for t in tq), ix))
+
+    pdict = {
+        # A duplicate phrase: the first one wins
+        "a": [(["b"], 0), (["b"], 1)],
+        # A longer phrase sharing a prefix with a shorter one
+        "c": [(["d", "e"], 2), (["f"], 3)],
+        # A shorter phrase that is a prefix of a longer one
+        "g": [(["h"], 4), (["h", "i"], 5)],
+    }
+    expected = [
+        ("a b c", ["a b:0", "c"]),
+        ("c d e", ["c d e:2"]),
+        ("c f", ["c f:3"]),
+        ("c d f", ["c", "d", "f"]),
+        ("c d", ["c", "d"]),
+        ("x c d e", ["x", "c d e:2"]),
+        ("c c f", ["c", "c f:3"]),
+        ("c d c d e", ["c", "d", "c d e:2"]),
+        ("g h i", ["g h:4", "i"]),
+    ]
+    for stream in (
+        PhraseStream(pdict),
+        PhraseStream(phrase_trie=compile_phrase_trie(pdict)),
+    ):
+        for text, result in expected:
+            toks = [Tok(w) for w in text.split()]
+            assert [t.txt for t in stream.process(iter(toks))] == result
+
+
+def test_sort_strings_binary():
+    """ The binary path and the C locale sort by code point """
+    strings = ["ö", "b", "Á", "á", "a", "B", "ab"]
+    result = ["B", "a", "ab", "b", "Á", "á", "ö"]
+    assert sort_strings(strings, binary=True) == result
+    assert sort_strings(strings, loc=("C", "")) == result
+    # The input list is left alone
+    assert strings == ["ö", "b", "Á", "á", "a", "B", "ab"]
+
+
+def test_sort_strings_icelandic():
+    """ By default, strings are sorted in Icelandic alphabetical order """
+    strings = ["ö", "æ", "þ", "z", "e", "ð", "d", "b", "á", "a"]
+    try:
+        result = sort_strings(strings)
+    except locale.Error:
+        # Without PyICU, the Icelandic locale must be installed
+        pytest.skip("Neither PyICU nor the Icelandic locale is available")
+    assert result == ["a", "á", "b", "d", "ð", "e", "z", "þ", "æ", "ö"]
+    assert sort_strings(["bók", "Ás", "akur", "ás"]) == ["akur", "ás", "Ás", "bók"]
+
+
+def test_sort_strings_threads():
+    """ Concurrent sorts give the same result as a single one,
+        and leave the process locale unchanged """
+    strings = ["{0}{1}".format(c, i) for i in range(50) for c in "öbÁáaBþð"]
+    loc = "C.UTF-8"
+    old_locale = locale.getlocale(locale.LC_COLLATE)
+    expected = sort_strings(strings, loc=loc)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda _: sort_strings(strings, loc=loc), range(32))
+        )
+    assert all(result == expected for result in results)
+    assert locale.getlocale(locale.LC_COLLATE) == old_locale
+
+
 def test_bin():
     """ Test querying for different cases of words """
 